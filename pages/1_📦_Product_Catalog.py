@@ -6,23 +6,18 @@ Browse, search, and filter all Cisco Meraki and Catalyst products
 import streamlit as st
 from utils.auth import require_auth, get_current_user, is_admin
 from utils.product_loader import get_product_loader
-from utils.filters import create_filter_sidebar, apply_filters
+from utils.translations import load_language
+from utils.filters import create_filter_sidebar, apply_filters, get_numeric_columns
 from utils.export import get_export_manager
-import json
 
-# Require authentication
-require_auth(lambda: main())
 
 def main():
     st.title("📦 Produktkatalog")
     st.markdown("Durchsuche alle Cisco Meraki & Catalyst Produkte")
     
     # Load translations
-    with open('data/translations.json', 'r', encoding='utf-8') as f:
-        translations = json.load(f)
-    
     lang = st.session_state.get('language', 'de')
-    t = translations[lang]
+    t = load_language(lang)
     
     # Initialize
     product_loader = get_product_loader()
@@ -32,7 +27,7 @@ def main():
     filters = create_filter_sidebar(product_loader)
     
     # Apply filters
-    filtered_products = apply_filters(all_products, filters)
+    filtered_products = apply_filters(all_products, filters, get_numeric_columns(product_loader))
     
     # Main content
     st.markdown("---")
@@ -563,4 +558,5 @@ def show_product_details_dialog(product, product_loader):
 
 
 if __name__ == "__main__":
-    main()
+    # Require authentication (the wrapper must be called, not just built)
+    require_auth(main)()
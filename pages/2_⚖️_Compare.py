@@ -6,22 +6,17 @@ Side-by-side comparison of products with detailed specifications
 import streamlit as st
 from utils.auth import require_auth, get_current_user
 from utils.product_loader import get_product_loader
+from utils.translations import load_language
 import pandas as pd
-import json
 
-# Require authentication
-require_auth(lambda: main())
 
 def main():
     st.title("⚖️ Produktvergleich")
     st.markdown("Vergleiche bis zu 4 Produkte nebeneinander")
     
     # Load translations
-    with open('data/translations.json', 'r', encoding='utf-8') as f:
-        translations = json.load(f)
-    
     lang = st.session_state.get('language', 'de')
-    t = translations[lang]
+    t = load_language(lang)
     
     # Initialize
     product_loader = get_product_loader()
@@ -591,4 +586,5 @@ def show_export_dialog(comparison_list, product_loader):
 
 
 if __name__ == "__main__":
-    main()
+    # Require authentication (the wrapper must be called, not just built)
+    require_auth(main)()
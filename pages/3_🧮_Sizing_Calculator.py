@@ -6,22 +6,17 @@ Calculate optimal network infrastructure sizing based on requirements
 import streamlit as st
 from utils.auth import require_auth, get_current_user
 from utils.product_loader import get_product_loader
-from utils.calculations import SizingCalculator
-import json
+from utils.translations import load_language
+from utils.calculations import SizingCalculator, DeploymentType, DeploymentScenario
 
-# Require authentication
-require_auth(lambda: main())
 
 def main():
     st.title("🧮 Sizing Calculator")
     st.markdown("Berechne die optimale Netzwerk-Infrastruktur für dein Projekt")
     
     # Load translations
-    with open('data/translations.json', 'r', encoding='utf-8') as f:
-        translations = json.load(f)
-    
     lang = st.session_state.get('language', 'de')
-    t = translations[lang]
+    t = load_language(lang)
     
     # Initialize
     product_loader = get_product_loader()
@@ -152,9 +147,9 @@ def calculate_access_points(calculator, product_loader):
                 results = calculator.calculate_ap_requirements(
                     area_sqm=area_sqm,
                     client_count=client_count,
-                    deployment_type=deployment_type,
+                    deployment_type=DeploymentType.from_label(deployment_type),
                     high_density=high_density
-                )
+                ).to_dict()
                 
                 # Adjust for future-proofing
                 if future_proof:
@@ -286,7 +281,7 @@ def calculate_firewalls(calculator, product_loader):
                     bandwidth_mbps=bandwidth_mbps,
                     vpn_tunnels=vpn_tunnels,
                     advanced_security=advanced_security
-                )
+                ).to_dict()
                 
                 results['parameters'] = {
                     'user_count': user_count,
@@ -397,7 +392,7 @@ def calculate_switches(calculator, product_loader):
                     poe_devices=poe_devices,
                     upoe_devices=upoe_devices,
                     stacking_required=stacking_required
-                )
+                ).to_dict()
                 
                 results['parameters'] = {
                     'access_ports': access_ports,
@@ -499,8 +494,8 @@ def calculate_ise(calculator, product_loader):
                 results = calculator.calculate_ise_requirements(
                     endpoint_count=endpoint_count,
                     concurrent_sessions=concurrent_sessions,
-                    deployment_scenario=deployment_scenario
-                )
+                    deployment_scenario=DeploymentScenario.from_label(deployment_scenario)
+                ).to_dict()
                 
                 results['parameters'] = {
                     'endpoint_count': endpoint_count,
@@ -836,4 +831,5 @@ def add_to_project(product, quantity):
 
 
 if __name__ == "__main__":
-    main()
+    # Require authentication (the wrapper must be called, not just built)
+    require_auth(main)()
@@ -7,11 +7,18 @@ import streamlit as st
 from utils.auth import require_auth, get_current_user
 from utils.product_loader import get_product_loader
 from utils.export import get_export_manager
+from utils.formatting import format_date
+from collections import Counter
 from datetime import datetime
 import json
+import os
+import threading
+from urllib.parse import quote
+
+# Append-only project log per user: one {"op": ..., ...} record per line, compacted periodically
+PROJECTS_LOG_DIR = os.path.join("data", "projects")
+COMPACT_EVERY = 50
 
-# Require authentication
-require_auth(lambda: main())
 
 def main():
     st.title("📊 Projekt-Management")
@@ -20,9 +27,12 @@ def main():
     # Initialize
     product_loader = get_product_loader()
     
-    # Initialize session state for projects
-    if 'projects' not in st.session_state:
-        st.session_state['projects'] = load_projects()
+    # Initialize session state for projects (reload when a different user logs in)
+    username = (get_current_user() or {}).get('username')
+    if 'projects' not in st.session_state or st.session_state.get('projects_owner') != username:
+        st.session_state['projects'] = load_projects(username)
+        st.session_state['projects_owner'] = username
+        st.session_state['_projects_log_writes'] = 0
     
     if 'current_project' not in st.session_state:
         st.session_state['current_project'] = None
@@ -65,20 +75,7 @@ def display_project_list():
     with col2:
         sort_by = st.selectbox("Sortieren", ["Neueste", "Name", "Kunde"])
     
-    # Filter projects
-    filtered_projects = projects
-    if search_query:
-        filtered_projects = [p for p in projects if 
-                            search_query.lower() in p.get('name', '').lower() or
-                            search_query.lower() in p.get('customer', '').lower()]
-    
-    # Sort projects
-    if sort_by == "Neueste":
-        filtered_projects.sort(key=lambda x: x.get('created_at', ''), reverse=True)
-    elif sort_by == "Name":
-        filtered_projects.sort(key=lambda x: x.get('name', ''))
-    elif sort_by == "Kunde":
-        filtered_projects.sort(key=lambda x: x.get('customer', ''))
+    filtered_projects = filter_and_sort_projects(projects, search_query, sort_by)
     
     st.markdown("---")
     
@@ -91,8 +88,10 @@ def display_project_list():
                 st.markdown(f"### {project.get('name', 'Unbenannt')}")
                 st.caption(f"👤 {project.get('customer', 'N/A')} | 📅 {format_date(project.get('created_at', ''))}")
             
+            summary = get_project_summary(project)
+            
             with col2:
-                st.metric("Positionen", len(project.get('items', [])))
+                st.metric("Positionen", summary['count'])
             
             with col3:
                 if st.button("📂 Öffnen", key=f"open_{project.get('id')}", use_container_width=True):
@@ -105,18 +104,40 @@ def display_project_list():
                     st.rerun()
             
             # Quick preview
-            if project.get('items'):
-                item_summary = {}
-                for item in project['items']:
-                    cat = item.get('category', 'Sonstiges')
-                    item_summary[cat] = item_summary.get(cat, 0) + item.get('quantity', 1)
-                
-                summary_text = " | ".join([f"{cat}: {count}" for cat, count in item_summary.items()])
+            if summary['by_cat']:
+                summary_text = " | ".join([f"{cat}: {count}" for cat, count in summary['by_cat'].items()])
                 st.caption(f"📦 {summary_text}")
             
             st.markdown("---")
 
 
+def filter_and_sort_projects(projects, search_query, sort_by):
+    """Filter and sort projects, reusing the last result while inputs and projects are unchanged"""
+    cache_key = (sort_by, search_query, id(projects), len(projects), st.session_state.get('_projects_revision', 0))
+    cached = st.session_state.get('_sorted_projects_cache')
+    if cached and cached[0] == cache_key:
+        return cached[1]
+    
+    # Filter projects
+    filtered_projects = projects
+    if search_query:
+        query = search_query.lower()
+        filtered_projects = [p for p in projects if 
+                            query in p.get('name', '').lower() or
+                            query in p.get('customer', '').lower()]
+    
+    # Sort projects
+    if sort_by == "Neueste":
+        filtered_projects = sorted(filtered_projects, key=lambda x: x.get('created_at', ''), reverse=True)
+    elif sort_by == "Name":
+        filtered_projects = sorted(filtered_projects, key=lambda x: x.get('name', ''))
+    elif sort_by == "Kunde":
+        filtered_projects = sorted(filtered_projects, key=lambda x: x.get('customer', ''))
+    
+    st.session_state['_sorted_projects_cache'] = (cache_key, filtered_projects)
+    return filtered_projects
+
+
 def create_new_project(product_loader):
     """Create new project form"""
     
@@ -210,10 +231,11 @@ def create_new_project(product_loader):
                 # Apply template if selected
                 if template != "Kein Template":
                     new_project['items'] = get_template_items(template)
+                update_project_summary(new_project)
                 
                 # Add to projects
                 st.session_state['projects'].append(new_project)
-                save_projects(st.session_state['projects'])
+                save_projects(st.session_state['projects'], upsert=new_project)
                 
                 # Set as current project
                 st.session_state['current_project'] = new_project
@@ -272,9 +294,9 @@ def display_bom(project, product_loader):
     col1, col2, col3 = st.columns([2, 1, 1])
     
     with col1:
-        st.metric("📦 Positionen", len(items))
-        total_qty = sum(item.get('quantity', 1) for item in items)
-        st.caption(f"Gesamtmenge: {total_qty} Stück")
+        summary = get_project_summary(project)
+        st.metric("📦 Positionen", summary['count'])
+        st.caption(f"Gesamtmenge: {summary['total_qty']} Stück")
     
     with col2:
         if st.button("📥 Export Excel", use_container_width=True):
@@ -317,6 +339,7 @@ def display_bom(project, product_loader):
                     )
                     if new_qty != item.get('quantity', 1):
                         item['quantity'] = new_qty
+                        update_project_summary(project)
                         save_current_project()
                 
                 with col3:
@@ -338,6 +361,7 @@ def display_bom(project, product_loader):
                 with col5:
                     if st.button("🗑️", key=f"remove_{item.get('product_id')}_{idx}"):
                         project['items'].remove(item)
+                        update_project_summary(project)
                         save_current_project()
                         st.rerun()
                 
@@ -397,21 +421,19 @@ def add_products_to_project(project, product_loader):
         search = st.text_input("Suche", placeholder="Produktname, SKU...")
     
     # Get products
-    if selected_category == "Alle":
-        products = product_loader.get_all_products()
-    elif selected_category == "Zubehör":
+    cat_key = None if selected_category == "Alle" else selected_category.lower().replace(" ", "_")
+    
+    if selected_category == "Zubehör":
         products = []  # Show accessories
         st.info("ℹ️ Zubehör-Suche in Entwicklung")
+    elif search:
+        # Vectorized name/SKU search
+        products = product_loader.search(search, category=cat_key, limit=10)
+    elif cat_key is None:
+        products = product_loader.get_all_products()
     else:
-        cat_key = selected_category.lower().replace(" ", "_")
         products = product_loader.get_products_by_category(cat_key)
     
-    # Filter by search
-    if search:
-        products = [p for p in products if 
-                   search.lower() in p.get('name', '').lower() or
-                   search.lower() in p.get('sku_base', '').lower()]
-    
     # Display products
     st.markdown("---")
     
@@ -461,20 +483,19 @@ def display_project_overview(project, product_loader):
     st.subheader("📊 Projekt-Übersicht")
     
     items = project.get('items', [])
+    summary = get_project_summary(project)
     
     # Metrics
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        st.metric("📦 Positionen", len(items))
+        st.metric("📦 Positionen", summary['count'])
     
     with col2:
-        total_qty = sum(item.get('quantity', 1) for item in items)
-        st.metric("🔢 Gesamtmenge", total_qty)
+        st.metric("🔢 Gesamtmenge", summary['total_qty'])
     
     with col3:
-        unique_categories = len(set(item.get('category', 'N/A') for item in items))
-        st.metric("🏷️ Kategorien", unique_categories)
+        st.metric("🏷️ Kategorien", len(summary['by_cat']))
     
     with col4:
         status = project.get('status', 'In Planung')
@@ -485,10 +506,7 @@ def display_project_overview(project, product_loader):
     # Category breakdown
     st.markdown("### 📊 Kategorie-Übersicht")
     
-    category_stats = {}
-    for item in items:
-        cat = item.get('category', 'Sonstiges')
-        category_stats[cat] = category_stats.get(cat, 0) + item.get('quantity', 1)
+    category_stats = summary['by_cat']
     
     if category_stats:
         import pandas as pd
@@ -611,17 +629,95 @@ def edit_project_settings(project):
 
 # Helper functions
 
-def load_projects():
-    """Load projects from file or session"""
-    # In production: Load from database or file
-    # For now: Use session state
-    return []
+def _projects_log_path(username):
+    """Project log of one user (username percent-encoded into a safe file name)"""
+    return os.path.join(PROJECTS_LOG_DIR, quote(username or "_anonymous", safe='') + ".jsonl")
+
+
+@st.cache_resource
+def _projects_log_lock():
+    """Process-wide lock serializing appends and compactions of the project logs"""
+    return threading.Lock()
+
 
+def load_projects(username):
+    """Load a user's projects by replaying their append-only log"""
+    with _projects_log_lock():
+        return _replay_projects_log(_projects_log_path(username))
 
-def save_projects(projects):
-    """Save projects to file or database"""
-    # In production: Save to database or file
+
+def _replay_projects_log(path):
+    """Replay a project log (last write wins); call with the log lock held"""
+    projects = {}
+    
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # Skip torn/partial lines
+                
+                if record.get('op') == 'upsert':
+                    project = record['project']
+                    projects[project.get('id')] = project
+                elif record.get('op') == 'delete':
+                    projects.pop(record.get('id'), None)
+    except FileNotFoundError:
+        return []
+    
+    return list(projects.values())
+
+
+def save_projects(projects, upsert=None, delete_id=None):
+    """Save projects to session and append the change to the project log"""
     st.session_state['projects'] = projects
+    st.session_state['_projects_revision'] = st.session_state.get('_projects_revision', 0) + 1
+    path = _projects_log_path(st.session_state.get('projects_owner'))
+    
+    records = []
+    if upsert is not None:
+        records.append({'op': 'upsert', 'project': _persistable_project(upsert)})
+    if delete_id is not None:
+        records.append({'op': 'delete', 'id': delete_id})
+    
+    if not records:
+        return
+    
+    writes = st.session_state.get('_projects_log_writes', 0) + len(records)
+    
+    with _projects_log_lock():
+        os.makedirs(PROJECTS_LOG_DIR, exist_ok=True)
+        with open(path, 'a', encoding='utf-8', buffering=8192) as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        
+        if writes >= COMPACT_EVERY:
+            compact_projects_log(path)
+            writes = 0
+    
+    st.session_state['_projects_log_writes'] = writes
+
+
+def compact_projects_log(path):
+    """Rewrite a project log as a snapshot of its replayed state; call with the log lock held"""
+    # Replay what is on disk, so records appended by other sessions are kept
+    projects = _replay_projects_log(path)
+    tmp_path = path + ".tmp"
+    
+    with open(tmp_path, 'w', encoding='utf-8', buffering=8192) as f:
+        for project in projects:
+            record = {'op': 'upsert', 'project': project}
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    
+    os.replace(tmp_path, path)
+
+
+def _persistable_project(project):
+    """Strip derived/cached keys (e.g. _summary) before persisting"""
+    return {k: v for k, v in project.items() if not k.startswith('_')}
 
 
 def save_current_project():
@@ -635,13 +731,13 @@ def save_current_project():
                 st.session_state['projects'][i] = st.session_state['current_project']
                 break
         
-        save_projects(st.session_state['projects'])
+        save_projects(st.session_state['projects'], upsert=st.session_state['current_project'])
 
 
 def delete_project(project_id):
     """Delete project"""
     st.session_state['projects'] = [p for p in st.session_state['projects'] if p.get('id') != project_id]
-    save_projects(st.session_state['projects'])
+    save_projects(st.session_state['projects'], delete_id=project_id)
 
 
 def generate_project_id():
@@ -650,18 +746,6 @@ def generate_project_id():
     return str(uuid.uuid4())[:8]
 
 
-def format_date(date_str):
-    """Format ISO date string to readable format"""
-    if not date_str:
-        return "N/A"
-    
-    try:
-        dt = datetime.fromisoformat(date_str)
-        return dt.strftime("%d.%m.%Y")
-    except:
-        return date_str
-
-
 def add_item_to_project(project, item):
     """Add item to project BOM"""
     # Check if item already exists
@@ -674,40 +758,61 @@ def add_item_to_project(project, item):
         # Add new item
         project['items'].append(item)
     
+    update_project_summary(project)
     save_current_project()
 
 
-def get_template_items(template_name):
-    """Get pre-filled items for template"""
-    
-    templates = {
-        "Small Office (10-50 Users)": [
-            {'product_id': 'mr36', 'product_name': 'Meraki MR36', 'sku': 'MR36-HW', 'quantity': 3, 'category': 'MR', 'comment': 'Office WLAN'},
-            {'product_id': 'mx75', 'product_name': 'Meraki MX75', 'sku': 'MX75-HW', 'quantity': 1, 'category': 'MX', 'comment': 'Firewall'},
-            {'product_id': 'ms120-24p', 'product_name': 'Meraki MS120-24P', 'sku': 'MS120-24P-HW', 'quantity': 2, 'category': 'MS', 'comment': 'Access Switches'},
-        ],
-        
-        "Medium Branch (50-250 Users)": [
-            {'product_id': 'mr46', 'product_name': 'Meraki MR46', 'sku': 'MR46-HW', 'quantity': 8, 'category': 'MR', 'comment': ''},
-            {'product_id': 'mx95', 'product_name': 'Meraki MX95', 'sku': 'MX95-HW', 'quantity': 2, 'category': 'MX', 'comment': 'HA Pair'},
-            {'product_id': 'ms225-48fp', 'product_name': 'Meraki MS225-48FP', 'sku': 'MS225-48FP-HW', 'quantity': 4, 'category': 'MS', 'comment': ''},
-            {'product_id': 'ms250-24', 'product_name': 'Meraki MS250-24', 'sku': 'MS250-24-HW', 'quantity': 1, 'category': 'MS', 'comment': 'Aggregation'},
-        ],
-        
-        "Large Campus (500+ Users)": [
-            {'product_id': 'mr56', 'product_name': 'Meraki MR56', 'sku': 'MR56-HW', 'quantity': 30, 'category': 'MR', 'comment': 'Indoor APs'},
-            {'product_id': 'mr46e', 'product_name': 'Meraki MR46E', 'sku': 'MR46E-HW', 'quantity': 5, 'category': 'MR', 'comment': 'Outdoor APs'},
-            {'product_id': 'mx250', 'product_name': 'Meraki MX250', 'sku': 'MX250-HW', 'quantity': 2, 'category': 'MX', 'comment': 'HA Pair'},
-            {'product_id': 'ms350-24x', 'product_name': 'Meraki MS350-24X', 'sku': 'MS350-24X-HW', 'quantity': 2, 'category': 'MS', 'comment': 'Core'},
-            {'product_id': 'ms390-48', 'product_name': 'Meraki MS390-48', 'sku': 'MS390-48-HW', 'quantity': 10, 'category': 'MS', 'comment': 'Distribution'},
-        ],
-        
-        "ISE Deployment": [
-            {'product_id': 'ise-3355', 'product_name': 'Cisco ISE-3355', 'sku': 'ISE-3355-K9', 'quantity': 2, 'category': 'ISE', 'comment': 'HA Pair'},
-        ],
-    }
+def update_project_summary(project):
+    """Recompute the cached BOM summary (positions, total quantity, per-category quantity)"""
+    items = project.get('items', [])
+    by_cat = Counter()
+    for item in items:
+        by_cat[item.get('category', 'Sonstiges')] += item.get('quantity', 1)
+    
+    project['_summary'] = {'count': len(items), 'total_qty': sum(by_cat.values()), 'by_cat': by_cat}
+    return project['_summary']
+
+
+def get_project_summary(project):
+    """Get cached BOM summary, computing it once if missing"""
+    summary = project.get('_summary')
+    if summary is None:
+        summary = update_project_summary(project)
+    return summary
+
+
+# Template BOMs (copied per project in get_template_items, never shared)
+_PROJECT_TEMPLATES = {
+    "Small Office (10-50 Users)": [
+        {'product_id': 'mr36', 'product_name': 'Meraki MR36', 'sku': 'MR36-HW', 'quantity': 3, 'category': 'MR', 'comment': 'Office WLAN'},
+        {'product_id': 'mx75', 'product_name': 'Meraki MX75', 'sku': 'MX75-HW', 'quantity': 1, 'category': 'MX', 'comment': 'Firewall'},
+        {'product_id': 'ms120-24p', 'product_name': 'Meraki MS120-24P', 'sku': 'MS120-24P-HW', 'quantity': 2, 'category': 'MS', 'comment': 'Access Switches'},
+    ],
+    
+    "Medium Branch (50-250 Users)": [
+        {'product_id': 'mr46', 'product_name': 'Meraki MR46', 'sku': 'MR46-HW', 'quantity': 8, 'category': 'MR', 'comment': ''},
+        {'product_id': 'mx95', 'product_name': 'Meraki MX95', 'sku': 'MX95-HW', 'quantity': 2, 'category': 'MX', 'comment': 'HA Pair'},
+        {'product_id': 'ms225-48fp', 'product_name': 'Meraki MS225-48FP', 'sku': 'MS225-48FP-HW', 'quantity': 4, 'category': 'MS', 'comment': ''},
+        {'product_id': 'ms250-24', 'product_name': 'Meraki MS250-24', 'sku': 'MS250-24-HW', 'quantity': 1, 'category': 'MS', 'comment': 'Aggregation'},
+    ],
     
-    return templates.get(template_name, [])
+    "Large Campus (500+ Users)": [
+        {'product_id': 'mr56', 'product_name': 'Meraki MR56', 'sku': 'MR56-HW', 'quantity': 30, 'category': 'MR', 'comment': 'Indoor APs'},
+        {'product_id': 'mr46e', 'product_name': 'Meraki MR46E', 'sku': 'MR46E-HW', 'quantity': 5, 'category': 'MR', 'comment': 'Outdoor APs'},
+        {'product_id': 'mx250', 'product_name': 'Meraki MX250', 'sku': 'MX250-HW', 'quantity': 2, 'category': 'MX', 'comment': 'HA Pair'},
+        {'product_id': 'ms350-24x', 'product_name': 'Meraki MS350-24X', 'sku': 'MS350-24X-HW', 'quantity': 2, 'category': 'MS', 'comment': 'Core'},
+        {'product_id': 'ms390-48', 'product_name': 'Meraki MS390-48', 'sku': 'MS390-48-HW', 'quantity': 10, 'category': 'MS', 'comment': 'Distribution'},
+    ],
+    
+    "ISE Deployment": [
+        {'product_id': 'ise-3355', 'product_name': 'Cisco ISE-3355', 'sku': 'ISE-3355-K9', 'quantity': 2, 'category': 'ISE', 'comment': 'HA Pair'},
+    ],
+}
+
+
+def get_template_items(template_name):
+    """Get pre-filled items for template as fresh copies"""
+    return [{**item} for item in _PROJECT_TEMPLATES.get(template_name, ())]
 
 
 def export_bom_excel(project):
@@ -755,4 +860,5 @@ def export_bom_pdf(project):
 
 
 if __name__ == "__main__":
-    main()
+    # Require authentication (the wrapper must be called, not just built)
+    require_auth(main)()
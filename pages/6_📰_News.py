@@ -5,34 +5,180 @@ Display product updates, EOL announcements, and admin news management
 
 import streamlit as st
 from utils.auth import require_auth, get_current_user, is_admin
+from utils.formatting import format_relative_date
 from datetime import datetime, timedelta
+import copy
+import html
 import json
+import os
+import threading
+
+# News storage: one JSON object per line, oldest first (new items are appended)
+NEWS_PATH = os.path.join("data", "news.jsonl")
+
+# Scope feed reruns to a fragment where supported (st.fragment needs Streamlit >= 1.33)
+_fragment = getattr(st, 'fragment', None) or getattr(st, 'experimental_fragment', None) or (lambda func: func)
+
+# Number of news cards rendered per feed page
+NEWS_PAGE_SIZE = 10
+
+# Opening tag of a news card; the card body is rendered inside it in the same st.markdown call
+_NEWS_CARD_OPEN = (
+    "<div style='border-left: 4px solid {border_color}; padding: 16px; margin-bottom: 16px; "
+    "background-color: {background_color}; border-radius: 4px;'>"
+)
+
+# Reference time for the default news items, fixed at import so cached entries stay stable
+_BASE_TIME = datetime.now()
+
+
+def load_news_items():
+    """Load news items from storage (cached until the file changes)"""
+    return _load_news_file(NEWS_PATH, *_news_file_signature())
+
+
+def _news_file_signature():
+    """(mtime_ns, size) of the news file; changes with every write by any session"""
+    try:
+        stat = os.stat(NEWS_PATH)
+        return stat.st_mtime_ns, stat.st_size
+    except FileNotFoundError:
+        return 0, -1
+
+
+@st.cache_data(show_spinner=False)
+def _load_news_file(filepath, mtime_ns, size):
+    """Parse the news file (mtime_ns/size key the cache, like product_loader._load_json_file)"""
+    try:
+        news_items = _read_news_file()
+    except FileNotFoundError:
+        news_items = copy.deepcopy(list(get_default_news_items()))
+    
+    for news in news_items:
+        index_news_item(news)
+    
+    return news_items
+
+
+def _read_news_file():
+    """Read all news items from disk, newest first (uncached; raises FileNotFoundError)"""
+    news_items = []
+    with open(NEWS_PATH, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                news_items.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue  # Skip torn/partial lines
+    news_items.reverse()  # Newest first, like the session list
+    return news_items
+
+
+@st.cache_resource
+def _news_file_lock():
+    """Process-wide lock serializing writes to the news file"""
+    return threading.Lock()
+
+
+@st.cache_resource
+def get_default_news_items():
+    """Default news items shown until news have been saved (built once per process)"""
+    return (
+        {
+            'id': 'news-001',
+            'title': 'MR36 End-of-Life angekündigt',
+            'category': 'EOL-Ankündigung',
+            'priority': 'important',
+            'content': 'Cisco hat das End-of-Life für das Meraki MR36 Access Point angekündigt. End-of-Sale: 31.12.2026, End-of-Support: 31.12.2031.\n\nWir empfehlen ein Upgrade auf MR46 oder MR56 für bessere Wi-Fi 6 Performance.',
+            'affected_products': ['mr36'],
+            'links': [
+                {'title': 'Offizielle EOL-Ankündigung', 'url': 'https://documentation.meraki.com'},
+                {'title': 'Migration Guide zu MR46', 'url': 'https://documentation.meraki.com'}
+            ],
+            'author': 'admin',
+            'published_at': (_BASE_TIME - timedelta(days=2)).isoformat(),
+            'expires_at': (_BASE_TIME + timedelta(days=90)).isoformat(),
+            'show_as_banner': True,
+            'status': 'published'
+        },
+        {
+            'id': 'news-002',
+            'title': 'Neue Wi-Fi 7 Access Points verfügbar',
+            'category': 'Neue Features',
+            'priority': 'info',
+            'content': 'Cisco Meraki hat die neue MR57 Serie mit Wi-Fi 7 Support vorgestellt. Verfügbar ab Q2/2026.\n\nKey Features:\n- Wi-Fi 7 (802.11be)\n- Bis zu 9.6 Gbps\n- Multi-Link Operation (MLO)\n- 6 GHz Support',
+            'affected_products': ['mr57'],
+            'links': [
+                {'title': 'MR57 Datasheet', 'url': 'https://documentation.meraki.com/MR/MR57_Datasheet'}
+            ],
+            'author': 'admin',
+            'published_at': (_BASE_TIME - timedelta(days=7)).isoformat(),
+            'expires_at': (_BASE_TIME + timedelta(days=60)).isoformat(),
+            'show_as_banner': False,
+            'status': 'published'
+        },
+        {
+            'id': 'news-003',
+            'title': 'Security Advisory: ISE Patch verfügbar',
+            'category': 'Security Advisory',
+            'priority': 'critical',
+            'content': '🔒 KRITISCHES SECURITY UPDATE\n\nCisco hat ein Security-Update für ISE veröffentlicht (CVE-2026-XXXX). Betroffen: ISE 3.1, 3.2.\n\n**Empfohlene Aktion:** Sofortiges Update auf neueste Patch-Version.\n\n**Severity:** High (CVSS 8.1)',
+            'affected_products': ['ise-3315', 'ise-3355', 'ise-3395'],
+            'links': [
+                {'title': 'Security Advisory', 'url': 'https://sec.cloudapps.cisco.com'},
+                {'title': 'Patch Download', 'url': 'https://software.cisco.com'}
+            ],
+            'author': 'security-team',
+            'published_at': (_BASE_TIME - timedelta(hours=6)).isoformat(),
+            'expires_at': (_BASE_TIME + timedelta(days=30)).isoformat(),
+            'show_as_banner': True,
+            'status': 'published'
+        },
+        {
+            'id': 'news-004',
+            'title': 'Dashboard Firmware Update v1.34',
+            'category': 'Produkt-Update',
+            'priority': 'info',
+            'content': 'Neues Meraki Dashboard Firmware Update verfügbar.\n\n**Neue Features:**\n- Verbessertes Reporting\n- API v1.41 Support\n- Bugfixes für MS Switches\n\nUpdate wird automatisch ausgerollt.',
+            'affected_products': [],
+            'links': [
+                {'title': 'Release Notes', 'url': 'https://documentation.meraki.com'}
+            ],
+            'author': 'admin',
+            'published_at': (_BASE_TIME - timedelta(days=14)).isoformat(),
+            'expires_at': (_BASE_TIME + timedelta(days=30)).isoformat(),
+            'show_as_banner': False,
+            'status': 'published'
+        },
+    )
 
-# Require authentication
-require_auth(lambda: main())
 
 def main():
     st.title("📰 News & Ankündigungen")
     st.markdown("Aktuelle Updates zu Cisco Produkten, EOL-Announcements und Feature-Releases")
     
     user = get_current_user()
+    admin = is_admin()
     
     st.markdown("---")
     
-    # Initialize news in session state
-    if 'news_items' not in st.session_state:
+    # Initialize news in session state (reload when any session changed the file)
+    signature = _news_file_signature()
+    if 'news_items' not in st.session_state or st.session_state.get('news_file_signature') != signature:
         st.session_state['news_items'] = load_news_items()
+        st.session_state['news_file_signature'] = signature
     
     # Tabs
-    if is_admin():
+    if admin:
         tab1, tab2, tab3 = st.tabs(["📰 Alle News", "➕ News erstellen", "⚙️ Verwaltung"])
     else:
         tab1, tab2 = st.tabs(["📰 Alle News", "🔔 Meine Benachrichtigungen"])
     
     with tab1:
-        display_news_feed()
+        display_news_feed(admin)
     
-    if is_admin():
+    if admin:
         with tab2:
             create_news_item()
         
@@ -43,72 +189,129 @@ def main():
             display_user_notifications()
 
 
-def display_news_feed():
+@_fragment
+def display_news_feed(admin=False):
     """Display news feed with filtering"""
     
     st.subheader("📰 News Feed")
     
     news_items = st.session_state.get('news_items', [])
     
-    # Filter options
-    col1, col2, col3 = st.columns([2, 2, 1])
+    # Filter options (in a form so typing/selecting only reruns on submit)
+    with st.form("news_search_form", clear_on_submit=False):
+        col1, col2, col3 = st.columns([2, 2, 1])
+        
+        with col1:
+            category_filter = st.selectbox(
+                "Kategorie",
+                ["Alle", "Produkt-Update", "EOL-Ankündigung", "Neue Features", "Security Advisory", "Allgemein"]
+            )
+        
+        with col2:
+            priority_filter = st.selectbox(
+                "Priorität",
+                ["Alle", "🔴 Kritisch", "🟡 Wichtig", "🟢 Info"]
+            )
+        
+        with col3:
+            sort_by = st.selectbox(
+                "Sortierung",
+                ["Neueste", "Älteste"]
+            )
+        
+        # Search
+        search_query = st.text_input("🔍 Suche", placeholder="Stichwort, Produkt...")
+        
+        st.form_submit_button("🔍 Filtern")
     
-    with col1:
-        category_filter = st.selectbox(
-            "Kategorie",
-            ["Alle", "Produkt-Update", "EOL-Ankündigung", "Neue Features", "Security Advisory", "Allgemein"]
-        )
+    st.markdown("---")
     
-    with col2:
-        priority_filter = st.selectbox(
-            "Priorität",
-            ["Alle", "🔴 Kritisch", "🟡 Wichtig", "🟢 Info"]
-        )
+    # Filter news
+    filtered_news = filter_news(news_items, category_filter, priority_filter, search_query, sort_by)
     
-    with col3:
-        sort_by = st.selectbox(
-            "Sortierung",
-            ["Neueste", "Älteste"]
-        )
+    # Display news items
+    if not filtered_news:
+        st.info("🔍 Keine News gefunden.")
+        return
     
-    # Search
-    search_query = st.text_input("🔍 Suche", placeholder="Stichwort, Produkt...")
+    # Pagination (back to the first page whenever the filters change)
+    filter_state = (category_filter, priority_filter, search_query, sort_by)
+    if st.session_state.get('news_filter_state') != filter_state:
+        st.session_state['news_filter_state'] = filter_state
+        st.session_state['news_page'] = 0
     
-    st.markdown("---")
+    num_pages = (len(filtered_news) - 1) // NEWS_PAGE_SIZE + 1
+    page = min(st.session_state.setdefault('news_page', 0), num_pages - 1)
+    start = page * NEWS_PAGE_SIZE
+    page_news = filtered_news[start:start + NEWS_PAGE_SIZE]
     
-    # Filter news
-    filtered_news = news_items
+    st.caption(f"Zeige {start + 1}-{start + len(page_news)} von {len(filtered_news)} News-Einträgen")
+    
+    for news in page_news:
+        display_news_card(news, admin)
     
-    if category_filter != "Alle":
-        filtered_news = [n for n in filtered_news if n.get('category') == category_filter]
+    if num_pages > 1:
+        col1, col2, col3 = st.columns([1, 2, 1])
+        
+        with col1:
+            st.button("← Zurück", key="news_prev", disabled=page == 0,
+                      on_click=_set_news_page, args=(page - 1,))
+        
+        with col2:
+            st.caption(f"Seite {page + 1} von {num_pages}")
+        
+        with col3:
+            st.button("Weiter →", key="news_next", disabled=page >= num_pages - 1,
+                      on_click=_set_news_page, args=(page + 1,))
+
+
+def _set_news_page(page):
+    """Button callback: switch news feed page"""
+    st.session_state['news_page'] = page
+
+
+@st.cache_data(show_spinner=False)
+def filter_news(news_items, category_filter, priority_filter, search_query, sort_by):
+    """Filter and sort news items (cached per filter state)"""
+    filtered_news = news_items
     
-    if priority_filter != "Alle":
-        priority_map = {"🔴 Kritisch": "critical", "🟡 Wichtig": "important", "🟢 Info": "info"}
-        filtered_news = [n for n in filtered_news if n.get('priority') == priority_map[priority_filter]]
+    # Category/priority via index lookup instead of scanning all items
+    if category_filter != "Alle" or priority_filter != "Alle":
+        by_category, by_priority = build_news_indexes(news_items)
+        
+        indices = None
+        if category_filter != "Alle":
+            indices = set(by_category.get(category_filter, ()))
+        
+        if priority_filter != "Alle":
+            priority_map = {"🔴 Kritisch": "critical", "🟡 Wichtig": "important", "🟢 Info": "info"}
+            priority_indices = by_priority.get(priority_map[priority_filter], ())
+            indices = set(priority_indices) if indices is None else indices.intersection(priority_indices)
+        
+        filtered_news = [news_items[i] for i in sorted(indices)]
     
     if search_query:
-        filtered_news = [n for n in filtered_news 
-                        if search_query.lower() in n.get('title', '').lower() or
-                        search_query.lower() in n.get('content', '').lower()]
+        q = search_query.lower()
+        filtered_news = [n for n in filtered_news if q in n['_title_lc'] or q in n['_content_lc']]
     
     # Sort
-    if sort_by == "Neueste":
-        filtered_news.sort(key=lambda x: x.get('published_at', ''), reverse=True)
-    else:
-        filtered_news.sort(key=lambda x: x.get('published_at', ''))
-    
-    # Display news items
-    if not filtered_news:
-        st.info("🔍 Keine News gefunden.")
-        return
+    return sorted(filtered_news, key=lambda x: x.get('published_at', ''), reverse=(sort_by == "Neueste"))
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def build_news_indexes(news_items):
+    """Index news item positions by category and by priority"""
+    by_category = {}
+    by_priority = {}
     
-    st.caption(f"Zeige {len(filtered_news)} News-Einträge")
+    for i, news in enumerate(news_items):
+        by_category.setdefault(news.get('category'), []).append(i)
+        by_priority.setdefault(news.get('priority'), []).append(i)
     
-    for news in filtered_news:
-        display_news_card(news)
+    return by_category, by_priority
 
 
-def display_news_card(news):
+def display_news_card(news, admin=False):
     """Display single news card"""
     
     # Priority badge
@@ -133,49 +336,41 @@ def display_news_card(news):
     }
     category_icon = category_icons.get(news.get('category', 'Allgemein'), "📰")
     
-    with st.container():
-        st.markdown(f"""
-        <div style='
-            border-left: 4px solid {border_color};
-            padding: 16px;
-            margin-bottom: 16px;
-            background-color: {"#fafafa" if st.session_state.get("theme") == "light" else "#1e1e1e"};
-            border-radius: 4px;
-        '>
-        """, unsafe_allow_html=True)
-        
-        # Header
-        col1, col2 = st.columns([4, 1])
-        
-        with col1:
-            st.markdown(f"### {category_icon} {news.get('title', 'Unbenannt')}")
-            st.caption(f"{priority_badge} | {news.get('category', 'Allgemein')} | {format_date(news.get('published_at', ''))}")
-        
-        with col2:
-            if is_admin():
-                if st.button("✏️", key=f"edit_{news.get('id')}"):
-                    st.session_state['editing_news'] = news.get('id')
-                    st.rerun()
-        
-        # Content
-        st.markdown(news.get('content', ''))
-        
-        # Affected products
-        if news.get('affected_products'):
-            st.markdown("**🔗 Betroffene Produkte:**")
-            products_str = ", ".join(news.get('affected_products', []))
-            st.markdown(f"`{products_str}`")
-        
-        # Links
-        if news.get('links'):
-            st.markdown("**📎 Weiterführende Links:**")
-            for link in news.get('links', []):
-                st.markdown(f"- [{link.get('title', 'Link')}]({link.get('url', '#')})")
-        
-        # Author
-        st.caption(f"Erstellt von: {news.get('author', 'N/A')}")
-        
-        st.markdown("</div>", unsafe_allow_html=True)
+    background_color = "#fafafa" if st.session_state.get("theme") == "light" else "#1e1e1e"
+    
+    # Build the whole card as one Markdown/HTML string; blank lines let Markdown render inside the div.
+    # The card is rendered with unsafe_allow_html, so every stored field is HTML-escaped.
+    esc = html.escape
+    card_parts = [
+        _NEWS_CARD_OPEN.format(border_color=border_color, background_color=background_color),
+        f"### {category_icon} {esc(str(news.get('title', 'Unbenannt')))}",
+        f"<small>{priority_badge} | {esc(str(news.get('category', 'Allgemein')))} | {esc(format_relative_date(news.get('published_at', '')))}</small>",
+        esc(str(news.get('content', '')))
+    ]
+    
+    # Affected products
+    if news.get('affected_products'):
+        products_str = esc(", ".join(news.get('affected_products', [])))
+        card_parts.append(f"**🔗 Betroffene Produkte:**\n<code>{products_str}</code>")
+    
+    # Links
+    if news.get('links'):
+        links_md = "\n".join(
+            f"- [{esc(str(link.get('title', 'Link')))}]({esc(str(link.get('url', '#')))})"
+            for link in news.get('links', [])
+        )
+        card_parts.append(f"**📎 Weiterführende Links:**\n{links_md}")
+    
+    # Author
+    card_parts.append(f"<small>Erstellt von: {esc(str(news.get('author', 'N/A')))}</small>")
+    card_parts.append("</div>")
+    
+    st.markdown("\n\n".join(card_parts), unsafe_allow_html=True)
+    
+    if admin:
+        if st.button("✏️", key=f"edit_{news.get('id')}"):
+            st.session_state['editing_news'] = news.get('id')
+            st.rerun()
     
     st.markdown("---")
 
@@ -241,18 +436,11 @@ def create_news_item():
         # Links
         st.markdown("### 📎 Links (optional)")
         
-        num_links = st.number_input("Anzahl Links", min_value=0, max_value=5, value=0)
-        
-        links = []
-        for i in range(num_links):
-            col1, col2 = st.columns(2)
-            with col1:
-                link_title = st.text_input(f"Link {i+1} Titel", key=f"link_title_{i}")
-            with col2:
-                link_url = st.text_input(f"Link {i+1} URL", key=f"link_url_{i}")
-            
-            if link_title and link_url:
-                links.append({'title': link_title, 'url': link_url})
+        links_text = st.text_area(
+            "Links (Titel|URL, eine pro Zeile)",
+            placeholder="MR57 Datasheet|https://documentation.meraki.com",
+            height=100
+        )
         
         # Banner option
         st.markdown("---")
@@ -268,6 +456,14 @@ def create_news_item():
             if not title or not content:
                 st.error("❌ Titel und Inhalt sind Pflichtfelder!")
             else:
+                # Parse links ("Titel|URL" per line)
+                links = [
+                    {'title': link_title.strip(), 'url': link_url.strip()}
+                    for line in links_text.splitlines() if '|' in line
+                    for link_title, link_url in [line.split('|', 1)]
+                    if link_title.strip() and link_url.strip()
+                ]
+                
                 # Create news item
                 priority_map = {"🟢 Info": "info", "🟡 Wichtig": "important", "🔴 Kritisch": "critical"}
                 
@@ -287,8 +483,9 @@ def create_news_item():
                 }
                 
                 # Add to news
+                index_news_item(new_news)
                 st.session_state['news_items'].insert(0, new_news)
-                save_news_items(st.session_state['news_items'])
+                append_news_item(new_news)
                 
                 st.success(f"✅ News '{title}' erfolgreich erstellt!")
                 
@@ -311,23 +508,27 @@ def manage_news_items():
         st.info("📭 Noch keine News erstellt.")
         return
     
-    # Statistics
+    # Statistics (single pass)
+    counts = {'published': 0, 'scheduled': 0, 'banner': 0}
+    for n in news_items:
+        status = n.get('status', '')
+        counts[status] = counts.get(status, 0) + 1
+        if n.get('show_as_banner'):
+            counts['banner'] += 1
+    
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
         st.metric("📰 Gesamt", len(news_items))
     
     with col2:
-        published = len([n for n in news_items if n.get('status') == 'published'])
-        st.metric("✅ Veröffentlicht", published)
+        st.metric("✅ Veröffentlicht", counts['published'])
     
     with col3:
-        scheduled = len([n for n in news_items if n.get('status') == 'scheduled'])
-        st.metric("⏰ Geplant", scheduled)
+        st.metric("⏰ Geplant", counts['scheduled'])
     
     with col4:
-        banners = len([n for n in news_items if n.get('show_as_banner')])
-        st.metric("📌 Banner", banners)
+        st.metric("📌 Banner", counts['banner'])
     
     st.markdown("---")
     
@@ -345,8 +546,8 @@ def manage_news_items():
                 st.markdown(f"**Status:** {news.get('status')}")
             
             with col2:
-                st.markdown(f"**Erstellt:** {format_date(news.get('published_at'))}")
-                st.markdown(f"**Läuft ab:** {format_date(news.get('expires_at'))}")
+                st.markdown(f"**Erstellt:** {format_relative_date(news.get('published_at'))}")
+                st.markdown(f"**Läuft ab:** {format_relative_date(news.get('expires_at'))}")
                 st.markdown(f"**Autor:** {news.get('author')}")
             
             with col3:
@@ -354,14 +555,35 @@ def manage_news_items():
                     st.success("📌 Banner: Ja")
                 else:
                     st.info("📌 Banner: Nein")
-                
-                if st.button("✏️ Bearbeiten", key=f"edit_mgmt_{news.get('id')}"):
-                    st.info("ℹ️ Bearbeiten-Funktion in Entwicklung")
-                
-                if st.button("🗑️ Löschen", key=f"delete_{news.get('id')}"):
-                    delete_news_item(news.get('id'))
-                    st.success("✅ News gelöscht!")
-                    st.rerun()
+    
+    st.markdown("---")
+    
+    # Actions (one selector instead of buttons per news item)
+    st.markdown("### 🛠️ Aktionen")
+    
+    titles = {news.get('id'): news.get('title', 'Unbenannt') for news in news_items}
+    
+    col1, col2, col3 = st.columns([2, 1, 1])
+    
+    with col1:
+        selected_id = st.selectbox(
+            "News auswählen",
+            list(titles),
+            format_func=lambda news_id: titles[news_id],
+            key="manage_news_selected"
+        )
+    
+    with col2:
+        st.write("")  # Spacing
+        if st.button("✏️ Bearbeiten", key="manage_news_edit"):
+            st.info("ℹ️ Bearbeiten-Funktion in Entwicklung")
+    
+    with col3:
+        st.write("")  # Spacing
+        if st.button("🗑️ Löschen", key="manage_news_delete"):
+            delete_news_item(selected_id)
+            st.success("✅ News gelöscht!")
+            st.rerun()
 
 
 def display_user_notifications():
@@ -429,91 +651,51 @@ def display_news_banner(news):
 
 # Helper functions
 
-def load_news_items():
-    """Load news items from storage"""
-    # In production: Load from database or file
-    # For now: Return default news items
-    
-    return [
-        {
-            'id': 'news-001',
-            'title': 'MR36 End-of-Life angekündigt',
-            'category': 'EOL-Ankündigung',
-            'priority': 'important',
-            'content': 'Cisco hat das End-of-Life für das Meraki MR36 Access Point angekündigt. End-of-Sale: 31.12.2026, End-of-Support: 31.12.2031.\n\nWir empfehlen ein Upgrade auf MR46 oder MR56 für bessere Wi-Fi 6 Performance.',
-            'affected_products': ['mr36'],
-            'links': [
-                {'title': 'Offizielle EOL-Ankündigung', 'url': 'https://documentation.meraki.com'},
-                {'title': 'Migration Guide zu MR46', 'url': 'https://documentation.meraki.com'}
-            ],
-            'author': 'admin',
-            'published_at': (datetime.now() - timedelta(days=2)).isoformat(),
-            'expires_at': (datetime.now() + timedelta(days=90)).isoformat(),
-            'show_as_banner': True,
-            'status': 'published'
-        },
-        {
-            'id': 'news-002',
-            'title': 'Neue Wi-Fi 7 Access Points verfügbar',
-            'category': 'Neue Features',
-            'priority': 'info',
-            'content': 'Cisco Meraki hat die neue MR57 Serie mit Wi-Fi 7 Support vorgestellt. Verfügbar ab Q2/2026.\n\nKey Features:\n- Wi-Fi 7 (802.11be)\n- Bis zu 9.6 Gbps\n- Multi-Link Operation (MLO)\n- 6 GHz Support',
-            'affected_products': ['mr57'],
-            'links': [
-                {'title': 'MR57 Datasheet', 'url': 'https://documentation.meraki.com/MR/MR57_Datasheet'}
-            ],
-            'author': 'admin',
-            'published_at': (datetime.now() - timedelta(days=7)).isoformat(),
-            'expires_at': (datetime.now() + timedelta(days=60)).isoformat(),
-            'show_as_banner': False,
-            'status': 'published'
-        },
-        {
-            'id': 'news-003',
-            'title': 'Security Advisory: ISE Patch verfügbar',
-            'category': 'Security Advisory',
-            'priority': 'critical',
-            'content': '🔒 KRITISCHES SECURITY UPDATE\n\nCisco hat ein Security-Update für ISE veröffentlicht (CVE-2026-XXXX). Betroffen: ISE 3.1, 3.2.\n\n**Empfohlene Aktion:** Sofortiges Update auf neueste Patch-Version.\n\n**Severity:** High (CVSS 8.1)',
-            'affected_products': ['ise-3315', 'ise-3355', 'ise-3395'],
-            'links': [
-                {'title': 'Security Advisory', 'url': 'https://sec.cloudapps.cisco.com'},
-                {'title': 'Patch Download', 'url': 'https://software.cisco.com'}
-            ],
-            'author': 'security-team',
-            'published_at': (datetime.now() - timedelta(hours=6)).isoformat(),
-            'expires_at': (datetime.now() + timedelta(days=30)).isoformat(),
-            'show_as_banner': True,
-            'status': 'published'
-        },
-        {
-            'id': 'news-004',
-            'title': 'Dashboard Firmware Update v1.34',
-            'category': 'Produkt-Update',
-            'priority': 'info',
-            'content': 'Neues Meraki Dashboard Firmware Update verfügbar.\n\n**Neue Features:**\n- Verbessertes Reporting\n- API v1.41 Support\n- Bugfixes für MS Switches\n\nUpdate wird automatisch ausgerollt.',
-            'affected_products': [],
-            'links': [
-                {'title': 'Release Notes', 'url': 'https://documentation.meraki.com'}
-            ],
-            'author': 'admin',
-            'published_at': (datetime.now() - timedelta(days=14)).isoformat(),
-            'expires_at': (datetime.now() + timedelta(days=30)).isoformat(),
-            'show_as_banner': False,
-            'status': 'published'
-        },
-    ]
+def index_news_item(news):
+    """Attach lowercase search fields to a news item"""
+    news['_title_lc'] = news.get('title', '').lower()
+    news['_content_lc'] = news.get('content', '').lower()
+    return news
 
 
 def save_news_items(news_items):
-    """Save news items to storage"""
-    # In production: Save to database or file
-    st.session_state['news_items'] = news_items
+    """Save all news items to storage (atomic rewrite); call with the news file lock held"""
+    os.makedirs(os.path.dirname(NEWS_PATH), exist_ok=True)
+    tmp_path = NEWS_PATH + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8', buffering=8192) as f:
+        for news in reversed(news_items):
+            f.write(json.dumps(_persistable_news(news), ensure_ascii=False) + "\n")
+    os.replace(tmp_path, NEWS_PATH)
+
+
+def append_news_item(news):
+    """Append a single new news item to storage"""
+    with _news_file_lock():
+        if not os.path.exists(NEWS_PATH):
+            # First write: persist the full list (including the defaults) once
+            save_news_items(st.session_state['news_items'])
+        else:
+            with open(NEWS_PATH, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(_persistable_news(news), ensure_ascii=False) + "\n")
+
+
+def _persistable_news(news):
+    """Strip derived search keys (e.g. _title_lc) before persisting"""
+    return {k: v for k, v in news.items() if not k.startswith('_')}
 
 
 def delete_news_item(news_id):
     """Delete news item"""
-    st.session_state['news_items'] = [n for n in st.session_state['news_items'] if n.get('id') != news_id]
-    save_news_items(st.session_state['news_items'])
+    with _news_file_lock():
+        # Rewrite from the file on disk, so items other sessions appended meanwhile are kept
+        try:
+            news_items = _read_news_file()
+        except FileNotFoundError:
+            news_items = st.session_state['news_items']
+        save_news_items([n for n in news_items if n.get('id') != news_id])
+    
+    st.session_state['news_items'] = load_news_items()
+    st.session_state['news_file_signature'] = _news_file_signature()
 
 
 def generate_news_id():
@@ -522,30 +704,6 @@ def generate_news_id():
     return f"news-{str(uuid.uuid4())[:8]}"
 
 
-def format_date(date_str):
-    """Format ISO date string to readable format"""
-    if not date_str:
-        return "N/A"
-    
-    try:
-        dt = datetime.fromisoformat(date_str)
-        now = datetime.now()
-        diff = now - dt
-        
-        if diff.days == 0:
-            if diff.seconds < 3600:
-                return f"vor {diff.seconds // 60} Minuten"
-            else:
-                return f"vor {diff.seconds // 3600} Stunden"
-        elif diff.days == 1:
-            return "Gestern"
-        elif diff.days < 7:
-            return f"vor {diff.days} Tagen"
-        else:
-            return dt.strftime("%d.%m.%Y")
-    except:
-        return date_str
-
-
 if __name__ == "__main__":
-    main()
+    # Require authentication (the wrapper must be called, not just built)
+    require_auth(main)()
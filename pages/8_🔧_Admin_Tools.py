@@ -8,9 +8,9 @@ from utils.auth import require_admin, get_current_user
 from utils.scraper import get_scraper
 from utils.product_loader import get_product_loader
 import os
+from collections import Counter
+import pandas as pd
 
-# Authentication required
-require_admin(lambda: main())
 
 def main():
     st.title("🔧 Admin Tools")
@@ -104,19 +104,17 @@ def main():
         product_loader = get_product_loader()
         
         # Statistics
-        all_products = product_loader.get_all_products()
+        total, active, eol, category_df = get_database_stats(product_loader.version)
         
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
-            st.metric("Gesamt Produkte", len(all_products))
+            st.metric("Gesamt Produkte", total)
         
         with col2:
-            active = len([p for p in all_products if p.get('status') == 'Active'])
             st.metric("Aktive Produkte", active)
         
         with col3:
-            eol = len([p for p in all_products if p.get('status') == 'EOL Announced'])
             st.metric("EOL Announced", eol)
         
         with col4:
@@ -128,16 +126,6 @@ def main():
         # Category breakdown
         st.subheader("Produkte pro Kategorie")
         
-        category_stats = {}
-        for product in all_products:
-            cat = product.get('category', 'Unknown')
-            category_stats[cat] = category_stats.get(cat, 0) + 1
-        
-        category_df = {
-            'Kategorie': list(category_stats.keys()),
-            'Anzahl': list(category_stats.values())
-        }
-        
         st.bar_chart(category_df, x='Kategorie', y='Anzahl')
         
         st.markdown("---")
@@ -153,16 +141,14 @@ def main():
         st.subheader("Produkt bearbeiten")
         
         product_loader = get_product_loader()
-        all_products = product_loader.get_all_products()
+        label_to_id, id_to_product = get_product_index(product_loader.version)
         
         # Product selector
-        product_names = [f"{p.get('name', '')} ({p.get('id', '')})" for p in all_products]
-        selected_product = st.selectbox("Produkt auswählen", product_names)
+        selected_product = st.selectbox("Produkt auswählen", list(label_to_id))
         
         if selected_product:
-            # Extract ID from selection
-            product_id = selected_product.split('(')[-1].replace(')', '')
-            product = product_loader.get_product_by_id(product_id)
+            product_id = label_to_id[selected_product]
+            product = id_to_product.get(product_id)
             
             if product:
                 with st.expander("📝 Produkt bearbeiten", expanded=True):
@@ -206,7 +192,7 @@ def main():
                             product['datasheet_url'] = datasheet_url
                             
                             # Save
-                            cat_key = product.get('_category_file', category.lower())
+                            cat_key = product_loader.get_product_category_key(product_id) or category.lower()
                             product_loader.save_product(cat_key, product)
                             
                             st.success("✅ Produkt aktualisiert!")
@@ -260,5 +246,39 @@ def main():
             st.success("✅ Cache geleert!")
 
 
+@st.cache_data(ttl=300)
+def get_cached_all_products(products_version):
+    """All products (cached; products_version is the loader's catalog version)"""
+    return get_product_loader().get_all_products()
+
+
+@st.cache_data(ttl=300)
+def get_product_index(products_version):
+    """Selectbox label -> product ID and product ID -> product lookups"""
+    all_products = get_cached_all_products(products_version)
+    
+    label_to_id = {f"{p.get('name', '')} ({p.get('id', '')})": p.get('id', '') for p in all_products}
+    id_to_product = {p.get('id'): p for p in all_products}
+    
+    return label_to_id, id_to_product
+
+
+@st.cache_data(ttl=60)
+def get_database_stats(products_version):
+    """Product counts and category breakdown (keyed on the loader's catalog version)"""
+    all_products = get_cached_all_products(products_version)
+    
+    status_counts = Counter(p.get('status') for p in all_products)
+    category_counts = Counter(p.get('category', 'Unknown') for p in all_products)
+    
+    category_df = pd.DataFrame({
+        'Kategorie': list(category_counts),
+        'Anzahl': list(category_counts.values())
+    })
+    
+    return len(all_products), status_counts['Active'], status_counts['EOL Announced'], category_df
+
+
 if __name__ == "__main__":
-    main()
+    # Require admin role (the wrapper must be called, not just built)
+    require_admin(main)()
@@ -4,63 +4,182 @@ Authentication and Authorization Functions
 
 import streamlit as st
 import bcrypt
-from datetime import datetime, timedelta
+import hashlib
+import math
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from firebase_admin import firestore
 from utils.firebase_config import get_db
 
+# Session lifetime after login (10 hours)
+SESSION_TIMEOUT_SECONDS = 10 * 3600
+
+# bcrypt cost factor for new hashes ($2b$12$...); existing hashes carry their own cost.
+# BCRYPT_ROUNDS is the floor; the cost is raised on fast hardware to reach BCRYPT_TARGET_MS per hash.
+BCRYPT_ROUNDS = 12
+BCRYPT_MAX_ROUNDS = 15
+BCRYPT_TARGET_MS = 250
+_bcrypt_cost = None
+
+# Recent verify_password results: blake2b(password|hash) -> (result, monotonic timestamp)
+_VERIFY_CACHE = {}
+VERIFY_CACHE_TTL = 60  # seconds
+VERIFY_CACHE_MAX_SIZE = 512
+
+# Resolved user document IDs: username -> (user_id, monotonic timestamp)
+_USER_ID_CACHE = {}
+USER_ID_CACHE_TTL = 300  # seconds
+USER_ID_CACHE_MAX_SIZE = 10000
+
+# The caches above are shared by all session threads
+_CACHE_LOCK = threading.Lock()
+
+def _cache_get(cache: dict, key, ttl: float):
+    """Return a cached value (or None); an expired entry for key is evicted"""
+    with _CACHE_LOCK:
+        cached = cache.get(key)
+        if cached is None:
+            return None
+        if time.monotonic() - cached[1] > ttl:
+            cache.pop(key, None)
+            return None
+    return cached[0]
+
+def _cache_set(cache: dict, key, value, max_size: int, ttl: float):
+    """Store a value; when full, purge expired entries and then drop the oldest (dicts keep insertion order)"""
+    now = time.monotonic()
+    with _CACHE_LOCK:
+        if len(cache) >= max_size:
+            expired = [k for k, (_, ts) in cache.items() if now - ts > ttl]
+            for k in expired:
+                del cache[k]
+            if len(cache) >= max_size:
+                del cache[next(iter(cache))]
+        cache[key] = (value, now)
+
 def hash_password(password: str) -> str:
     """Hash a password using bcrypt"""
-    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+    return hash_password_bytes(password.encode('utf-8')).decode('utf-8')
+
+def hash_password_bytes(password: bytes) -> bytes:
+    """Hash an already encoded password using bcrypt"""
+    return bcrypt.hashpw(password, bcrypt.gensalt(rounds=get_bcrypt_cost()))
+
+def get_bcrypt_cost() -> int:
+    """bcrypt cost calibrated once per process to reach BCRYPT_TARGET_MS per hash"""
+    global _bcrypt_cost
+    
+    if _bcrypt_cost is None:
+        # Time one hash at the floor cost; each extra round doubles the work
+        start = time.perf_counter()
+        bcrypt.hashpw(b"calibration", bcrypt.gensalt(rounds=BCRYPT_ROUNDS))
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        
+        extra_rounds = math.ceil(math.log2(BCRYPT_TARGET_MS / elapsed_ms)) if elapsed_ms < BCRYPT_TARGET_MS else 0
+        _bcrypt_cost = min(BCRYPT_ROUNDS + extra_rounds, BCRYPT_MAX_ROUNDS)
+    
+    return _bcrypt_cost
 
 def verify_password(password: str, hashed: str) -> bool:
-    """Verify a password against a hash"""
-    return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+    """Verify a password against a hash (recent results are cached for VERIFY_CACHE_TTL seconds)"""
+    return verify_password_bytes(password.encode('utf-8'), hashed.encode('utf-8'))
 
-def check_account_locked(user_doc):
+def verify_password_bytes(password: bytes, hashed: bytes) -> bool:
+    """Verify an already encoded password against an encoded hash (cached like verify_password)"""
+    key = hashlib.blake2b(password + b"|" + hashed, digest_size=16).digest()
+    
+    cached = _cache_get(_VERIFY_CACHE, key, VERIFY_CACHE_TTL)
+    if cached is not None:
+        return cached
+    
+    result = bcrypt.checkpw(password, hashed)
+    _cache_set(_VERIFY_CACHE, key, result, VERIFY_CACHE_MAX_SIZE, VERIFY_CACHE_TTL)
+    
+    return result
+
+def get_user_id(db, username: str):
+    """Resolve a username to its user document ID via the usernames index (cached)"""
+    user_id = _cache_get(_USER_ID_CACHE, username, USER_ID_CACHE_TTL)
+    if user_id is not None:
+        return user_id
+    
+    # Direct key read on usernames/{username}; keys are exact-case, like the username field,
+    # so "Bob" and "bob" never share an index document
+    index_doc = db.collection('usernames').document(username).get()
+    
+    if index_doc.exists:
+        user_id = index_doc.to_dict().get('uid')
+    else:
+        # Users created before the index existed: query once and backfill
+        user_query = db.collection('users').where('username', '==', username).limit(1).get()
+        if not user_query:
+            return None
+        user_id = user_query[0].id
+        db.collection('usernames').document(username).set({'uid': user_id})
+    
+    _cache_set(_USER_ID_CACHE, username, user_id, USER_ID_CACHE_MAX_SIZE, USER_ID_CACHE_TTL)
+    return user_id
+
+def check_account_locked(user_data: dict):
     """Check if account is locked due to failed login attempts"""
-    locked_until = user_doc.get('locked_until')
+    locked_until = user_data.get('locked_until')
     
     if locked_until:
-        if datetime.now() < locked_until:
-            remaining = (locked_until - datetime.now()).seconds // 60
+        now = datetime.now(timezone.utc)
+        if now < locked_until:
+            remaining = (locked_until - now).seconds // 60
             return True, remaining
-        else:
-            # Unlock account
-            db = get_db()
-            user_ref = db.collection('users').document(user_doc.id)
-            user_ref.update({
-                'login_attempts': 0,
-                'locked_until': None
-            })
     
     return False, 0
 
-def increment_login_attempts(user_id: str):
-    """Increment failed login attempts and lock if threshold reached"""
-    db = get_db()
-    user_ref = db.collection('users').document(user_id)
-    user_doc = user_ref.get()
+def increment_login_attempts(user_data: dict):
+    """Count a failed login attempt; returns (attempts, update_data) and locks if threshold reached"""
+    # An expired lock starts a fresh count and is cleared in the same write
+    expired_lock = bool(user_data.get('locked_until'))
+    previous = 0 if expired_lock else user_data.get('login_attempts', 0)
+    attempts = previous + 1
     
-    if user_doc.exists:
-        attempts = user_doc.to_dict().get('login_attempts', 0) + 1
-        
-        update_data = {'login_attempts': attempts}
-        
-        # Lock account after 5 failed attempts for 30 minutes
-        if attempts >= 5:
-            update_data['locked_until'] = datetime.now() + timedelta(minutes=30)
-        
-        user_ref.update(update_data)
-        
-        return attempts
+    update_data = {'login_attempts': attempts}
+    if expired_lock:
+        update_data['locked_until'] = None
+    
+    # Lock account after 5 failed attempts for 30 minutes
+    if attempts >= 5:
+        update_data['locked_until'] = datetime.now(timezone.utc) + timedelta(minutes=30)
+    
+    return attempts, update_data
 
-def reset_login_attempts(user_id: str):
-    """Reset login attempts after successful login"""
-    db = get_db()
-    user_ref = db.collection('users').document(user_id)
-    user_ref.update({
+def reset_login_attempts() -> dict:
+    """Update data resetting login attempts after successful login"""
+    return {
         'login_attempts': 0,
         'locked_until': None
-    })
+    }
+
+@firestore.transactional
+def _login_transaction(transaction, user_ref, password: str):
+    """Read the user, check lock and password, and write the resulting state once"""
+    user_snapshot = user_ref.get(transaction=transaction)
+    if not user_snapshot.exists:
+        return 'missing', None, 0
+    
+    user_data = user_snapshot.to_dict()
+    
+    # Check if account is locked
+    is_locked, remaining_minutes = check_account_locked(user_data)
+    if is_locked:
+        return 'locked', user_data, remaining_minutes
+    
+    # Verify password
+    if verify_password(password, user_data['password']):
+        if user_data.get('login_attempts') or user_data.get('locked_until'):
+            transaction.update(user_ref, reset_login_attempts())
+        return 'success', user_data, 0
+    
+    attempts, update_data = increment_login_attempts(user_data)
+    transaction.update(user_ref, update_data)
+    return 'failed', user_data, attempts
 
 def login(username: str, password: str) -> tuple:
     """
@@ -68,43 +187,41 @@ def login(username: str, password: str) -> tuple:
     Returns: (success: bool, user_data: dict, message: str)
     """
     db = get_db()
-    users_ref = db.collection('users')
     
     # Find user by username
-    user_query = users_ref.where('username', '==', username).limit(1).get()
+    user_id = get_user_id(db, username)
     
-    if not user_query:
+    if not user_id:
         return False, None, "Benutzername oder Passwort falsch"
     
-    user_doc = user_query[0]
-    user_data = user_doc.to_dict()
+    user_ref = db.collection('users').document(user_id)
     
-    # Check if account is locked
-    is_locked, remaining_minutes = check_account_locked(user_doc)
-    if is_locked:
-        return False, None, f"Account gesperrt. Versuche es in {remaining_minutes} Minuten erneut."
+    # Lock check, password check and attempt bookkeeping in one transaction
+    outcome, user_data, value = _login_transaction(db.transaction(), user_ref, password)
     
-    # Verify password
-    if verify_password(password, user_data['password']):
-        # Reset login attempts
-        reset_login_attempts(user_doc.id)
-        
+    if outcome == 'missing':
+        return False, None, "Benutzername oder Passwort falsch"
+    
+    if outcome == 'locked':
+        return False, None, f"Account gesperrt. Versuche es in {value} Minuten erneut."
+    
+    if outcome == 'success':
         # Set session with 10-hour expiration
         st.session_state['authenticated'] = True
         st.session_state['user'] = {
-            'id': user_doc.id,
+            'id': user_id,
             'username': user_data['username'],
             'role': user_data['role'],
             'email': user_data.get('email', ''),
             'language': user_data.get('language', 'de')
         }
         st.session_state['login_time'] = datetime.now()
+        st.session_state['login_deadline'] = time.monotonic() + SESSION_TIMEOUT_SECONDS
+        _bump_auth_token()
         
         return True, st.session_state['user'], "Login erfolgreich"
     else:
-        # Increment failed attempts
-        attempts = increment_login_attempts(user_doc.id)
-        remaining_attempts = 5 - attempts
+        remaining_attempts = 5 - value
         
         if remaining_attempts > 0:
             return False, None, f"Benutzername oder Passwort falsch. Noch {remaining_attempts} Versuche übrig."
@@ -113,30 +230,48 @@ def login(username: str, password: str) -> tuple:
 
 def logout():
     """Clear session state"""
-    for key in ['authenticated', 'user', 'login_time']:
+    for key in ['authenticated', 'user', 'login_time', 'login_deadline']:
         if key in st.session_state:
             del st.session_state[key]
+    _bump_auth_token()
+
+def _bump_auth_token():
+    """Invalidate the memoized auth state after login/logout"""
+    st.session_state['_auth_token'] = st.session_state.get('_auth_token', 0) + 1
+
+def _auth_state():
+    """(authenticated, role), memoized in the session until the auth token changes"""
+    token = st.session_state.get('_auth_token', 0)
+    cached = st.session_state.get('_auth_state')
+    
+    if cached is None or cached[0] != token:
+        authenticated = st.session_state.get('authenticated', False)
+        role = st.session_state.get('user', {}).get('role') if authenticated else None
+        cached = (token, authenticated, role)
+        st.session_state['_auth_state'] = cached
+    
+    return cached[1], cached[2]
 
 def check_session_timeout():
     """Check if session has expired (10 hours)"""
-    if 'login_time' in st.session_state:
-        elapsed = datetime.now() - st.session_state['login_time']
-        if elapsed > timedelta(hours=10):
-            logout()
-            return True
+    deadline = st.session_state.get('login_deadline')
+    if deadline is not None and time.monotonic() > deadline:
+        logout()
+        return True
     return False
 
 def is_authenticated():
     """Check if user is authenticated and session is valid"""
     if check_session_timeout():
         return False
-    return st.session_state.get('authenticated', False)
+    return _auth_state()[0]
 
 def is_admin():
     """Check if current user is admin"""
-    if is_authenticated():
-        return st.session_state.get('user', {}).get('role') == 'admin'
-    return False
+    if check_session_timeout():
+        return False
+    authenticated, role = _auth_state()
+    return authenticated and role == 'admin'
 
 def get_current_user():
     """Get current logged-in user"""
@@ -168,5 +303,8 @@ def change_password(user_id: str, new_password: str):
     hashed_pw = hash_password(new_password)
     user_ref.update({'password': hashed_pw})
     
+    with _CACHE_LOCK:
+        _VERIFY_CACHE.clear()
+    
     return True
 
@@ -3,39 +3,198 @@ Sizing and Calculation Functions
 """
 
 import streamlit as st
-from typing import Dict, List, Tuple
+import numpy as np
+from bisect import bisect_left
+from dataclasses import dataclass, fields
+from enum import IntEnum
+from functools import lru_cache
+from typing import Dict, List, Tuple, Union
+
+# Numba (optional) JIT-compiles the batch sizing loops
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+class DeploymentType(IntEnum):
+    OFFICE = 0
+    WAREHOUSE = 1
+    HOSPITAL = 2
+    SCHOOL = 3
+    RETAIL = 4
+    STADIUM = 5
+    
+    @classmethod
+    def from_label(cls, label: str) -> "DeploymentType":
+        """Map a UI label (e.g. "Office") to the enum; unknown labels size like Office"""
+        return _DEPLOYMENT_TYPE_BY_LABEL.get(label, cls.OFFICE)
+
+
+class DeploymentScenario(IntEnum):
+    SINGLE_SITE = 0
+    DISTRIBUTED = 1
+    HIGH_AVAILABILITY = 2
+    
+    @classmethod
+    def from_label(cls, label: str) -> "DeploymentScenario":
+        """Map a UI label (e.g. "Single Site") to the enum; unknown labels size like Single Site"""
+        return _DEPLOYMENT_SCENARIO_BY_LABEL.get(label, cls.SINGLE_SITE)
+    
+    @property
+    def label(self) -> str:
+        return _DEPLOYMENT_SCENARIO_LABELS[self]
+
+
+_DEPLOYMENT_TYPE_BY_LABEL = {
+    "Office": DeploymentType.OFFICE,
+    "Warehouse": DeploymentType.WAREHOUSE,
+    "Hospital": DeploymentType.HOSPITAL,
+    "School": DeploymentType.SCHOOL,
+    "Retail": DeploymentType.RETAIL,
+    "Stadium": DeploymentType.STADIUM
+}
+
+_DEPLOYMENT_SCENARIO_LABELS = ("Single Site", "Distributed Multi-Site", "High Availability")
+_DEPLOYMENT_SCENARIO_BY_LABEL = {label: DeploymentScenario(i) for i, label in enumerate(_DEPLOYMENT_SCENARIO_LABELS)}
+
+# Coverage area per AP (m²), indexed by DeploymentType
+_AP_COVERAGE_PER_AP = (200, 350, 150, 180, 160, 100)
+
+# AP model suggestions: high-density, > 50 clients per AP, standard
+_AP_HD_SUGGESTIONS = ("MR46", "MR56", "MR57", "C9124AXI", "C9164I")
+_AP_MID_SUGGESTIONS = ("MR36", "MR46", "C9120AXI")
+_AP_LOW_SUGGESTIONS = ("MR28", "MR36", "C9115AXI")
+
+# MX sizing tiers: (max users, max throughput Gbps, models); a tier fits if both limits hold.
+# Both limits are non-decreasing, so the first fitting tier is the max of the two bisect indices.
+_MX_TIERS = (
+    (50, 0.5, ("MX67", "MX68")),
+    (200, 1, ("MX75",)),
+    (250, 1, ("MX85",)),
+    (500, 2.5, ("MX95",)),
+    (2000, float('inf'), ("MX250",)),
+    (float('inf'), float('inf'), ("MX450",)),
+)
+_MX_USER_LIMITS = tuple(users for users, _, _ in _MX_TIERS)
+_MX_BW_LIMITS = tuple(gbps for _, gbps, _ in _MX_TIERS)
+_MX_MODEL_SETS = tuple(models for _, _, models in _MX_TIERS) + (
+    ("MX75", "MX85"),    # > 100 VPN tunnels on the smallest tier
+    ("MX95", "MX250"),   # > 250 VPN tunnels
+)
+_MX_VPN_SMALL = 6
+_MX_VPN_LARGE = 7
+
+# Same tiers as arrays for the batch lookup
+_MX_USER_THRESHOLDS = np.array(_MX_USER_LIMITS)
+_MX_BW_THRESHOLDS = np.array(_MX_BW_LIMITS)
+_MX_MODELS = np.empty(len(_MX_MODEL_SETS), dtype=object)
+_MX_MODELS[:] = _MX_MODEL_SETS
+
+# Access switch tiers: (max access ports, UPOE choice, PoE choice, non-PoE choice) as (model, quantity)
+_SWITCH_PORT_LIMITS = (8, 24, 48)
+_SWITCH_TIERS = (
+    (None, ('MS120-8FP', 1), ('MS120-8', 1)),
+    (('MS350-24X', 1), ('MS120-24P', 1), ('MS120-24', 1)),
+    (('MS350-24X', 2), ('MS225-48FP', 1), ('MS225-48', 1)),
+)
+
+# ISE appliance by endpoint count: up to each limit, the model at the same position (last: above all)
+_ISE_ENDPOINT_LIMITS = (5000, 50000, 100000, 200000)
+_ISE_MODELS = ("ISE-3315", "ISE-3355", "ISE-3395", "ISE-3415", "ISE-3495")
+
+
+def _ap_counts_numpy(areas, client_counts, base_coverage, max_clients_per_ap):
+    """Recommended AP count per scenario (max of area and client based count)"""
+    aps_by_area = (areas / base_coverage).astype(np.int64) + 1
+    aps_by_clients = (client_counts / max_clients_per_ap).astype(np.int64) + 1
+    return np.maximum(aps_by_area, aps_by_clients)
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _ap_counts(areas, client_counts, base_coverage, max_clients_per_ap):
+        """Recommended AP count per scenario (compiled loop)"""
+        out = np.empty(areas.shape[0], dtype=np.int64)
+        for i in range(areas.shape[0]):
+            aps_by_area = int(areas[i] / base_coverage) + 1
+            aps_by_clients = int(client_counts[i] / max_clients_per_ap) + 1
+            out[i] = max(aps_by_area, aps_by_clients)
+        return out
+    
+    # Compile (or load from cache) at import so the first real call skips it
+    _ap_counts(np.zeros(1), np.zeros(1), 200.0, 100.0)
+else:
+    _ap_counts = _ap_counts_numpy
+
+
+class _SizingResult:
+    """Base for sizing results; to_dict() gives the plain dict used by the pages"""
+    __slots__ = ()
+    
+    def to_dict(self) -> Dict:
+        result = {}
+        for f in fields(self):
+            value = getattr(self, f.name)
+            if isinstance(value, tuple):
+                # Copy nested dicts too, results may be shared through the lru_cache
+                value = [dict(v) if isinstance(v, dict) else v for v in value]
+            result[f.name] = value
+        return result
+
+
+@dataclass(frozen=True, slots=True)
+class ApSizing(_SizingResult):
+    recommended_aps: int
+    ap_model_suggestions: Tuple[str, ...]
+    reasoning: str
+
+
+@dataclass(frozen=True, slots=True)
+class FirewallSizing(_SizingResult):
+    recommended_models: Tuple[str, ...]
+    ha_recommended: bool
+    reasoning: str
+
+
+@dataclass(frozen=True, slots=True)
+class SwitchSizing(_SizingResult):
+    recommended_switches: Tuple[Dict, ...]
+    total_poe_budget_needed: int
+    reasoning: str
+
+
+@dataclass(frozen=True, slots=True)
+class IseSizing(_SizingResult):
+    recommended_model: str
+    node_count: int
+    deployment_architecture: str
+    reasoning: str
+
 
 class SizingCalculator:
-    """Calculate sizing recommendations for network deployments"""
+    """Calculate sizing recommendations for network deployments (results are memoized, treat them as read-only)"""
     
     @staticmethod
+    @lru_cache(maxsize=4096)
     def calculate_ap_requirements(
         area_sqm: float,
         client_count: int,
-        deployment_type: str = "Office",
-        high_density: bool = False
-    ) -> Dict:
+        deployment_type: Union[DeploymentType, str] = DeploymentType.OFFICE,
+        high_density: bool = False,
+        explain: bool = True
+    ) -> ApSizing:
         """
         Calculate Access Point requirements
+        (explain=False skips building the reasoning text)
         
         Returns:
-        {
-            'recommended_aps': int,
-            'ap_model_suggestions': List[str],
-            'reasoning': str
-        }
+            ApSizing (recommended_aps, ap_model_suggestions, reasoning)
         """
         # Coverage area per AP based on deployment type
-        coverage_per_ap = {
-            "Office": 200,
-            "Warehouse": 350,
-            "Hospital": 150,
-            "School": 180,
-            "Retail": 160,
-            "Stadium": 100
-        }
-        
-        base_coverage = coverage_per_ap.get(deployment_type, 200)
+        if isinstance(deployment_type, str):
+            deployment_type = DeploymentType.from_label(deployment_type)
+        base_coverage = _AP_COVERAGE_PER_AP[deployment_type]
         
         # Calculate based on area
         aps_by_area = int(area_sqm / base_coverage) + 1
@@ -49,94 +208,131 @@ class SizingCalculator:
         
         # Suggest AP models
         if high_density:
-            suggestions = ["MR46", "MR56", "MR57", "C9124AXI", "C9164I"]
+            suggestions = _AP_HD_SUGGESTIONS
         elif client_count / recommended_aps > 50:
-            suggestions = ["MR36", "MR46", "C9120AXI"]
+            suggestions = _AP_MID_SUGGESTIONS
         else:
-            suggestions = ["MR28", "MR36", "C9115AXI"]
+            suggestions = _AP_LOW_SUGGESTIONS
         
-        reasoning = f"Basierend auf {area_sqm:.0f}m² Fläche und {client_count} Clients: "
-        reasoning += f"{aps_by_area} APs für Flächenabdeckung, {aps_by_clients} APs für Client-Kapazität."
+        reasoning = ""
+        if explain:
+            reasoning = f"Basierend auf {area_sqm:.0f}m² Fläche und {client_count} Clients: "
+            reasoning += f"{aps_by_area} APs für Flächenabdeckung, {aps_by_clients} APs für Client-Kapazität."
         
-        return {
-            'recommended_aps': recommended_aps,
-            'ap_model_suggestions': suggestions,
-            'reasoning': reasoning
-        }
+        return ApSizing(recommended_aps, suggestions, reasoning)
     
     @staticmethod
+    def calculate_ap_counts_batch(
+        areas_sqm: np.ndarray,
+        client_counts: np.ndarray,
+        deployment_type: Union[DeploymentType, str] = DeploymentType.OFFICE,
+        high_density: bool = False
+    ) -> np.ndarray:
+        """
+        Recommended AP counts for many scenarios at once (same rules as calculate_ap_requirements)
+        
+        Returns:
+            Array of recommended AP counts, one per scenario
+        """
+        if isinstance(deployment_type, str):
+            deployment_type = DeploymentType.from_label(deployment_type)
+        base_coverage = float(_AP_COVERAGE_PER_AP[deployment_type])
+        max_clients_per_ap = 200.0 if high_density else 100.0
+        
+        return _ap_counts(
+            np.asarray(areas_sqm, dtype=np.float64),
+            np.asarray(client_counts, dtype=np.float64),
+            base_coverage,
+            max_clients_per_ap
+        )
+    
+    @staticmethod
+    @lru_cache(maxsize=4096)
     def calculate_firewall_requirements(
         user_count: int,
         bandwidth_mbps: int,
         vpn_tunnels: int = 0,
-        advanced_security: bool = True
-    ) -> Dict:
+        advanced_security: bool = True,
+        explain: bool = True
+    ) -> FirewallSizing:
         """
         Calculate Firewall (MX) requirements
+        (explain=False skips building the reasoning text)
         
         Returns:
-        {
-            'recommended_models': List[str],
-            'ha_recommended': bool,
-            'reasoning': str
-        }
+            FirewallSizing (recommended_models, ha_recommended, reasoning)
         """
         bandwidth_gbps = bandwidth_mbps / 1000
         
         # Base recommendations
-        if user_count <= 50 and bandwidth_gbps <= 0.5:
-            models = ["MX67", "MX68"]
-        elif user_count <= 200 and bandwidth_gbps <= 1:
-            models = ["MX75"]
-        elif user_count <= 250 and bandwidth_gbps <= 1:
-            models = ["MX85"]
-        elif user_count <= 500 and bandwidth_gbps <= 2.5:
-            models = ["MX95"]
-        elif user_count <= 2000:
-            models = ["MX250"]
-        else:
-            models = ["MX450"]
+        idx = max(bisect_left(_MX_USER_LIMITS, user_count), bisect_left(_MX_BW_LIMITS, bandwidth_gbps))
         
         # Adjust for VPN tunnels
-        if vpn_tunnels > 100:
-            if "MX67" in models or "MX68" in models:
-                models = ["MX75", "MX85"]
-            if vpn_tunnels > 250:
-                models = ["MX95", "MX250"]
+        if vpn_tunnels > 250:
+            idx = _MX_VPN_LARGE
+        elif vpn_tunnels > 100 and idx == 0:
+            idx = _MX_VPN_SMALL
+        
+        models = _MX_MODEL_SETS[idx]
         
         # HA recommendation
         ha_recommended = user_count > 100 or vpn_tunnels > 50
         
-        reasoning = f"Für {user_count} User, {bandwidth_gbps:.1f} Gbps Throughput"
-        if vpn_tunnels > 0:
-            reasoning += f" und {vpn_tunnels} VPN Tunnel"
-        reasoning += ". "
+        reasoning = ""
+        if explain:
+            reasoning = f"Für {user_count} User, {bandwidth_gbps:.1f} Gbps Throughput"
+            if vpn_tunnels > 0:
+                reasoning += f" und {vpn_tunnels} VPN Tunnel"
+            reasoning += ". "
+            
+            if ha_recommended:
+                reasoning += "HA-Paar wird empfohlen für Redundanz."
         
-        if ha_recommended:
-            reasoning += "HA-Paar wird empfohlen für Redundanz."
+        return FirewallSizing(models, ha_recommended, reasoning)
+    
+    @staticmethod
+    def calculate_firewall_models_batch(
+        user_counts: np.ndarray,
+        bandwidths_mbps: np.ndarray,
+        vpn_tunnels: np.ndarray = None
+    ) -> List[List[str]]:
+        """
+        Recommend MX models for many scenarios at once
+        
+        Returns:
+            List of model lists, one per scenario
+        """
+        user_counts = np.asarray(user_counts)
+        bandwidths_gbps = np.asarray(bandwidths_mbps) / 1000
         
-        return {
-            'recommended_models': models,
-            'ha_recommended': ha_recommended,
-            'reasoning': reasoning
-        }
+        idx = np.maximum(
+            np.searchsorted(_MX_USER_THRESHOLDS, user_counts),
+            np.searchsorted(_MX_BW_THRESHOLDS, bandwidths_gbps)
+        )
+        
+        # Adjust for VPN tunnels
+        if vpn_tunnels is not None:
+            vpn_tunnels = np.asarray(vpn_tunnels)
+            idx = np.where((vpn_tunnels > 100) & (idx == 0), _MX_VPN_SMALL, idx)
+            idx = np.where(vpn_tunnels > 250, _MX_VPN_LARGE, idx)
+        
+        return [list(models) for models in _MX_MODELS[idx]]
     
     @staticmethod
+    @lru_cache(maxsize=4096)
     def calculate_switch_requirements(
         access_ports_needed: int,
         poe_devices: int,
         upoe_devices: int = 0,
-        stacking_required: bool = False
-    ) -> Dict:
+        stacking_required: bool = False,
+        explain: bool = True
+    ) -> SwitchSizing:
         """
         Calculate Switch requirements
+        (explain=False skips building the reasoning text)
         
         Returns:
-        {
-            'recommended_switches': List[Dict],
-            'total_poe_budget_needed': int,
-            'reasoning': str
-        }
+            SwitchSizing (recommended_switches, total_poe_budget_needed, reasoning)
         """
         # Calculate PoE budget needed
         poe_budget_needed = (poe_devices * 30) + (upoe_devices * 60)  # PoE+ = 30W, UPOE = 60W
@@ -144,27 +340,19 @@ class SizingCalculator:
         switches = []
         
         # Determine switch models
-        if access_ports_needed <= 8:
-            if poe_devices > 0:
-                switches.append({'model': 'MS120-8FP', 'quantity': 1})
-            else:
-                switches.append({'model': 'MS120-8', 'quantity': 1})
+        tier = bisect_left(_SWITCH_PORT_LIMITS, access_ports_needed)
         
-        elif access_ports_needed <= 24:
-            if upoe_devices > 0:
-                switches.append({'model': 'MS350-24X', 'quantity': 1})
+        if tier < len(_SWITCH_TIERS):
+            upoe_choice, poe_choice, plain_choice = _SWITCH_TIERS[tier]
+            
+            if upoe_devices > 0 and upoe_choice:
+                model, quantity = upoe_choice
             elif poe_devices > 0:
-                switches.append({'model': 'MS120-24P', 'quantity': 1})
+                model, quantity = poe_choice
             else:
-                switches.append({'model': 'MS120-24', 'quantity': 1})
-        
-        elif access_ports_needed <= 48:
-            if upoe_devices > 0:
-                switches.append({'model': 'MS350-24X', 'quantity': 2})
-            elif poe_devices > 0:
-                switches.append({'model': 'MS225-48FP', 'quantity': 1})
-            else:
-                switches.append({'model': 'MS225-48', 'quantity': 1})
+                model, quantity = plain_choice
+            
+            switches.append({'model': model, 'quantity': quantity})
         
         else:
             # Multiple switches needed
@@ -180,62 +368,49 @@ class SizingCalculator:
         if stacking_required and len(switches) > 0 and switches[0]['quantity'] > 1:
             switches.append({'model': 'MA-CBL-40G-2M', 'quantity': switches[0]['quantity'] - 1, 'type': 'stacking_cable'})
         
-        reasoning = f"{access_ports_needed} Access-Ports benötigt, davon {poe_devices} PoE+ und {upoe_devices} UPOE. "
-        reasoning += f"Gesamt PoE-Budget: {poe_budget_needed}W."
+        reasoning = ""
+        if explain:
+            reasoning = f"{access_ports_needed} Access-Ports benötigt, davon {poe_devices} PoE+ und {upoe_devices} UPOE. "
+            reasoning += f"Gesamt PoE-Budget: {poe_budget_needed}W."
         
-        return {
-            'recommended_switches': switches,
-            'total_poe_budget_needed': poe_budget_needed,
-            'reasoning': reasoning
-        }
+        return SwitchSizing(tuple(switches), poe_budget_needed, reasoning)
     
     @staticmethod
+    @lru_cache(maxsize=4096)
     def calculate_ise_requirements(
         endpoint_count: int,
         concurrent_sessions: int,
-        deployment_scenario: str = "Single Site"
-    ) -> Dict:
+        deployment_scenario: Union[DeploymentScenario, str] = DeploymentScenario.SINGLE_SITE,
+        explain: bool = True
+    ) -> IseSizing:
         """
         Calculate ISE requirements
+        (explain=False skips building the reasoning text)
         
         Returns:
-        {
-            'recommended_model': str,
-            'node_count': int,
-            'deployment_architecture': str,
-            'reasoning': str
-        }
+            IseSizing (recommended_model, node_count, deployment_architecture, reasoning)
         """
         # Single appliance sizing
-        if endpoint_count <= 5000:
-            model = "ISE-3315"
-        elif endpoint_count <= 50000:
-            model = "ISE-3355"
-        elif endpoint_count <= 100000:
-            model = "ISE-3395"
-        elif endpoint_count <= 200000:
-            model = "ISE-3415"
-        else:
-            model = "ISE-3495"
+        model = _ISE_MODELS[bisect_left(_ISE_ENDPOINT_LIMITS, endpoint_count)]
         
         # Distributed deployment
-        if deployment_scenario == "Distributed Multi-Site":
+        if isinstance(deployment_scenario, str):
+            deployment_scenario = DeploymentScenario.from_label(deployment_scenario)
+        
+        if deployment_scenario == DeploymentScenario.DISTRIBUTED:
             node_count = max(2, int(endpoint_count / 50000) + 1)
             architecture = "Distributed (2x PAN, 2x MnT, Nx PSN)"
-        elif deployment_scenario == "High Availability":
+        elif deployment_scenario == DeploymentScenario.HIGH_AVAILABILITY:
             node_count = 2
             architecture = "HA Pair (Active-Standby PAN/MnT/PSN)"
         else:
             node_count = 1
             architecture = "Standalone"
         
-        reasoning = f"{endpoint_count:,} Endpoints, {concurrent_sessions:,} gleichzeitige Sessions. "
-        reasoning += f"{deployment_scenario}-Szenario empfiehlt {architecture}."
+        reasoning = ""
+        if explain:
+            reasoning = f"{endpoint_count:,} Endpoints, {concurrent_sessions:,} gleichzeitige Sessions. "
+            reasoning += f"{deployment_scenario.label}-Szenario empfiehlt {architecture}."
         
-        return {
-            'recommended_model': model,
-            'node_count': node_count,
-            'deployment_architecture': architecture,
-            'reasoning': reasoning
-        }
+        return IseSizing(model, node_count, architecture, reasoning)
 
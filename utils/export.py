@@ -3,10 +3,14 @@ Export Functions for Excel and PDF
 """
 
 import io
-import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Iterable, Iterator, Sequence, Tuple
 import streamlit as st
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, PatternFill, Alignment
+from openpyxl.utils import get_column_letter
 
 try:
     from reportlab.lib import colors
@@ -20,12 +24,174 @@ try:
 except ImportError:
     REPORTLAB_AVAILABLE = False
 
+# PDF styles (built once, shared by all documents)
+if REPORTLAB_AVAILABLE:
+    _HEADER_BLUE = colors.HexColor('#0066cc')
+    _ALT_GREY = colors.HexColor('#f5f5f5')
+    _SAMPLE_STYLES = getSampleStyleSheet()
+    
+    _PRODUCT_TITLE_STYLE = ParagraphStyle(
+        'CustomTitle',
+        parent=_SAMPLE_STYLES['Heading1'],
+        fontSize=18,
+        textColor=_HEADER_BLUE,
+        spaceAfter=12
+    )
+    _BOM_TITLE_STYLE = ParagraphStyle(
+        'CustomTitle',
+        parent=_SAMPLE_STYLES['Heading1'],
+        fontSize=20,
+        textColor=_HEADER_BLUE,
+        spaceAfter=12
+    )
+    
+    _PRODUCT_TABLE_STYLE = TableStyle([
+        # Header
+        ('BACKGROUND', (0, 0), (-1, 0), _HEADER_BLUE),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 10),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
+        
+        # Body
+        ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+        ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
+        ('ALIGN', (0, 1), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 1), (-1, -1), 8),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, _ALT_GREY]),
+        
+        # Grid
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ('TOPPADDING', (0, 1), (-1, -1), 6),
+        ('BOTTOMPADDING', (0, 1), (-1, -1), 6),
+    ])
+    
+    _BOM_COLWIDTHS = [1.5*cm, 5*cm, 3*cm, 2*cm, 3*cm, 5.5*cm]
+    _BOM_TABLE_STYLE = TableStyle([
+        # Header
+        ('BACKGROUND', (0, 0), (-1, 0), _HEADER_BLUE),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 9),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
+        
+        # Body
+        ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+        ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
+        ('ALIGN', (0, 1), (0, -1), 'CENTER'),  # Pos. centered
+        ('ALIGN', (3, 1), (3, -1), 'CENTER'),  # Quantity centered
+        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 1), (-1, -1), 8),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, _ALT_GREY]),
+        
+        # Grid
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ('TOPPADDING', (0, 1), (-1, -1), 6),
+        ('BOTTOMPADDING', (0, 1), (-1, -1), 6),
+    ])
+
+# Excel header styling (shared by all sheets)
+_HEADER_FONT = Font(bold=True, color='FFFFFF')
+_HEADER_FILL = PatternFill(fgColor='0066CC', patternType='solid')
+_HEADER_ALIGNMENT = Alignment(horizontal='center')
+_TITLE_FONT = Font(bold=True, size=14)
+_MAX_COLUMN_WIDTH = 50
+
+# Rough .xlsx size: fixed package overhead plus compressed bytes per row
+_XLSX_BASE_BYTES = 8192
+_XLSX_BYTES_PER_ROW = 96
+
+# Runs the Excel and PDF BOM export side by side (see export_project_bom_both)
+_EXPORT_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="export")
+
+# BOM rows per PDF table (even, so the alternating row colors line up across chunks)
+_BOM_TABLE_CHUNK_ROWS = 40
+
+# Product sheet columns
+_PRODUCT_BASE_HEADER = ('Name', 'Kategorie', 'Unterkategorie', 'SKU', 'Status')
+_PRODUCT_TAIL_HEADER = ('EOL Datum', 'Datasheet URL')
+_LICENSE_HEADER = ('Produkt', 'Produkt SKU', 'Lizenz-Typ', 'Lizenz SKU')
+_ACCESSORY_HEADER = ('Produkt', 'Produkt SKU', 'Zubehör ID')
+
+# BOM sheet columns: project item keys and their headers
+_BOM_COLUMNS = ('product_name', 'sku', 'quantity', 'category', 'comment')
+_BOM_HEADERS = ('Produktname', 'SKU', 'Menge', 'Kategorie', 'Kommentar')
+
+# Category-specific spec columns: (header, product field, default)
+_AP_SPEC_COLUMNS = (
+    ('Wi-Fi Standard', 'wifi_standard', ''),
+    ('Max. Data Rate', 'max_data_rate', ''),
+    ('PoE Anforderung', 'poe_requirement', ''),
+    ('Empf. Clients', 'recommended_clients', ''),
+)
+_MX_SPEC_COLUMNS = (
+    ('Firewall Throughput', 'firewall_throughput', ''),
+    ('VPN Throughput', 'vpn_throughput', ''),
+    ('Max VPN Tunnel', 'max_vpn_tunnels', ''),
+    ('Empf. User', 'recommended_users', ''),
+)
+_SWITCH_SPEC_COLUMNS = (
+    ('Ports Gesamt', 'total_ports', ''),
+    ('PoE Ports', 'poe_ports', 0),
+    ('PoE Budget', 'poe_budget', ''),
+    ('Stacking', 'stacking', ''),
+)
+_ISE_SPEC_COLUMNS = (
+    ('Deployment Typ', 'deployment_type', ''),
+    ('Max. Endpoints', 'recommended_endpoints', ''),
+    ('CPU', 'cpu', ''),
+    ('RAM', 'ram', ''),
+)
+_CATEGORY_SPEC_MAP = {
+    'MR': _AP_SPEC_COLUMNS,
+    'Catalyst AP': _AP_SPEC_COLUMNS,
+    'MX': _MX_SPEC_COLUMNS,
+    'MS': _SWITCH_SPEC_COLUMNS,
+    'Catalyst Switch': _SWITCH_SPEC_COLUMNS,
+    'ISE': _ISE_SPEC_COLUMNS,
+}
+
+# Category groups for the PDF key-spec column
+_AP_CATEGORIES = frozenset({'MR', 'Catalyst AP'})
+_SWITCH_CATEGORIES = frozenset({'MS', 'Catalyst Switch'})
+
+HEADERS_BY_CATEGORY = {
+    category: tuple(header for header, _, _ in columns)
+    for category, columns in _CATEGORY_SPEC_MAP.items()
+}
+
+
+def _spec_extractor(columns):
+    """Build a function returning the spec values of a product as a tuple"""
+    fields = tuple((field, default) for _, field, default in columns)
+    return lambda product: tuple(product.get(field, default) for field, default in fields)
+
+
+_SPEC_EXTRACTORS = {
+    category: _spec_extractor(columns)
+    for category, columns in _CATEGORY_SPEC_MAP.items()
+}
+
+
+def _sized_buffer(est_rows: int, bytes_per_row: int = _XLSX_BYTES_PER_ROW) -> io.BytesIO:
+    """
+    BytesIO pre-sized for about est_rows rows, positioned at the start
+    
+    Writes overwrite the zero padding in place; call truncate() after writing.
+    """
+    return io.BytesIO(bytes(_XLSX_BASE_BYTES + est_rows * bytes_per_row))
+
 
 class ExportManager:
     """Manage exports to Excel and PDF"""
     
     def __init__(self):
-        self.styles = getSampleStyleSheet() if REPORTLAB_AVAILABLE else None
+        self.styles = _SAMPLE_STYLES if REPORTLAB_AVAILABLE else None
     
     def export_products_to_excel(
         self,
@@ -39,32 +205,30 @@ class ExportManager:
         
         Returns BytesIO buffer with Excel file
         """
-        output = io.BytesIO()
+        output = _sized_buffer(len(products))
+        workbook = Workbook(write_only=True)
+        
+        # Main product sheet
+        self._write_sheet(
+            workbook, 'Produkte',
+            self._product_header(products, include_specs),
+            self._prepare_product_rows(products, include_specs)
+        )
         
-        # Create Excel writer
-        with pd.ExcelWriter(output, engine='openpyxl') as writer:
-            # Main product sheet
-            product_data = self._prepare_product_data(products, include_specs)
-            df_products = pd.DataFrame(product_data)
-            df_products.to_excel(writer, sheet_name='Produkte', index=False)
-            
-            # License sheet
-            if include_licenses:
-                license_data = self._prepare_license_data(products)
-                if license_data:
-                    df_licenses = pd.DataFrame(license_data)
-                    df_licenses.to_excel(writer, sheet_name='Lizenzen', index=False)
-            
-            # Accessories sheet
-            if include_accessories:
-                accessory_data = self._prepare_accessory_data(products)
-                if accessory_data:
-                    df_accessories = pd.DataFrame(accessory_data)
-                    df_accessories.to_excel(writer, sheet_name='Zubehör', index=False)
-            
-            # Format worksheets
-            self._format_excel_worksheets(writer)
+        # License sheet
+        if include_licenses:
+            license_rows = list(self._prepare_license_rows(products))
+            if license_rows:
+                self._write_sheet(workbook, 'Lizenzen', _LICENSE_HEADER, license_rows)
         
+        # Accessories sheet
+        if include_accessories:
+            accessory_rows = list(self._prepare_accessory_rows(products))
+            if accessory_rows:
+                self._write_sheet(workbook, 'Zubehör', _ACCESSORY_HEADER, accessory_rows)
+        
+        workbook.save(output)
+        output.truncate()
         output.seek(0)
         return output
     
@@ -88,22 +252,20 @@ class ExportManager:
             }
         ]
         """
-        output = io.BytesIO()
+        output = _sized_buffer(len(project_items), 32)
+        workbook = Workbook(write_only=True)
         
-        with pd.ExcelWriter(output, engine='openpyxl') as writer:
-            # BOM Sheet
-            df_bom = pd.DataFrame(project_items)
-            df_bom.to_excel(writer, sheet_name='Stückliste', index=False)
-            
-            # Summary Sheet
-            if include_summary:
-                summary_data = self._prepare_project_summary(project_name, project_items)
-                df_summary = pd.DataFrame(summary_data)
-                df_summary.to_excel(writer, sheet_name='Zusammenfassung', index=False)
-            
-            # Format
-            self._format_bom_worksheets(writer, project_name)
+        # BOM Sheet (with project name above the header)
+        bom_rows = (tuple(item.get(key, '') for key in _BOM_COLUMNS) for item in project_items)
+        self._write_sheet(workbook, 'Stückliste', _BOM_HEADERS, bom_rows, title=f"Projekt: {project_name}")
+        
+        # Summary Sheet
+        if include_summary:
+            summary_data = self._prepare_project_summary(project_name, project_items)
+            self._write_sheet(workbook, 'Zusammenfassung', *self._dict_rows(summary_data))
         
+        workbook.save(output)
+        output.truncate()
         output.seek(0)
         return output
     
@@ -134,14 +296,7 @@ class ExportManager:
         story = []
         
         # Title
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=self.styles['Heading1'],
-            fontSize=18,
-            textColor=colors.HexColor('#0066cc'),
-            spaceAfter=12
-        )
-        story.append(Paragraph(title, title_style))
+        story.append(Paragraph(title, _PRODUCT_TITLE_STYLE))
         story.append(Spacer(1, 0.5*cm))
         
         # Metadata
@@ -158,29 +313,7 @@ class ExportManager:
         
         # Create table
         table = Table(table_data, repeatRows=1)
-        table.setStyle(TableStyle([
-            # Header
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#0066cc')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-            
-            # Body
-            ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-            ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-            ('ALIGN', (0, 1), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 1), (-1, -1), 8),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f5f5f5')]),
-            
-            # Grid
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('TOPPADDING', (0, 1), (-1, -1), 6),
-            ('BOTTOMPADDING', (0, 1), (-1, -1), 6),
-        ]))
+        table.setStyle(_PRODUCT_TABLE_STYLE)
         
         story.append(table)
         
@@ -221,14 +354,7 @@ class ExportManager:
         story = []
         
         # Title
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=self.styles['Heading1'],
-            fontSize=20,
-            textColor=colors.HexColor('#0066cc'),
-            spaceAfter=12
-        )
-        story.append(Paragraph(f"Stückliste: {project_name}", title_style))
+        story.append(Paragraph(f"Stückliste: {project_name}", _BOM_TITLE_STYLE))
         story.append(Spacer(1, 0.3*cm))
         
         # Customer info
@@ -252,33 +378,12 @@ class ExportManager:
                 item.get('comment', '')
             ])
         
-        table = Table(table_data, colWidths=[1.5*cm, 5*cm, 3*cm, 2*cm, 3*cm, 5.5*cm])
-        table.setStyle(TableStyle([
-            # Header
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#0066cc')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 9),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-            
-            # Body
-            ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-            ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-            ('ALIGN', (0, 1), (0, -1), 'CENTER'),  # Pos. centered
-            ('ALIGN', (3, 1), (3, -1), 'CENTER'),  # Quantity centered
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 1), (-1, -1), 8),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f5f5f5')]),
-            
-            # Grid
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('TOPPADDING', (0, 1), (-1, -1), 6),
-            ('BOTTOMPADDING', (0, 1), (-1, -1), 6),
-        ]))
+        # One table per chunk keeps ReportLab's split/layout work bounded for large BOMs
+        header, body = table_data[0], table_data[1:]
+        for start in range(0, max(len(body), 1), _BOM_TABLE_CHUNK_ROWS):
+            chunk = [header] + body[start:start + _BOM_TABLE_CHUNK_ROWS]
+            story.append(Table(chunk, colWidths=_BOM_COLWIDTHS, repeatRows=1, style=_BOM_TABLE_STYLE))
         
-        story.append(table)
         story.append(Spacer(1, 1*cm))
         
         # Summary
@@ -292,86 +397,103 @@ class ExportManager:
         output.seek(0)
         return output
     
+    def export_project_bom_both(
+        self,
+        project_name: str,
+        project_items: List[Dict],
+        include_summary: bool = True,
+        customer_info: Optional[Dict] = None
+    ) -> Tuple[io.BytesIO, io.BytesIO]:
+        """
+        Export project BOM to Excel and PDF concurrently
+        
+        Both exports only touch their own workbook/document and buffer, so they
+        can run in parallel. Returns (excel_buffer, pdf_buffer).
+        """
+        excel_future = _EXPORT_POOL.submit(
+            self.export_project_bom_to_excel, project_name, project_items, include_summary
+        )
+        pdf_future = _EXPORT_POOL.submit(
+            self.export_project_bom_to_pdf, project_name, project_items, customer_info
+        )
+        return excel_future.result(), pdf_future.result()
+    
     # Helper methods
     
-    def _prepare_product_data(self, products: List[Dict], include_specs: bool) -> List[Dict]:
-        """Prepare product data for Excel export"""
-        data = []
+    def _spec_offsets(self, products: List[Dict], include_specs: bool) -> Tuple[Dict[str, int], Tuple[str, ...]]:
+        """Spec column offset per category and the spec headers, for the categories present"""
+        if not include_specs:
+            return {}, ()
+        
+        # Categories with spec columns, in first-seen order (one lookup per product)
+        categories = dict.fromkeys(
+            category for category in (p.get('category') for p in products)
+            if category in HEADERS_BY_CATEGORY
+        )
+        
+        # Categories sharing a column set (e.g. MR / Catalyst AP) share one block
+        group_offsets = {}
+        spec_headers = ()
+        for category in categories:
+            headers = HEADERS_BY_CATEGORY[category]
+            if headers not in group_offsets:
+                group_offsets[headers] = len(spec_headers)
+                spec_headers += headers
+        
+        offsets = {category: group_offsets[HEADERS_BY_CATEGORY[category]] for category in categories}
+        return offsets, spec_headers
+    
+    def _product_header(self, products: List[Dict], include_specs: bool) -> Tuple[str, ...]:
+        """Column header of the product sheet"""
+        _, spec_headers = self._spec_offsets(products, include_specs)
+        return _PRODUCT_BASE_HEADER + spec_headers + _PRODUCT_TAIL_HEADER
+    
+    def _prepare_product_rows(self, products: List[Dict], include_specs: bool) -> Iterator[tuple]:
+        """Yield product rows for Excel export, in the order of _product_header"""
+        offsets, spec_headers = self._spec_offsets(products, include_specs)
+        spec_width = len(spec_headers)
         
         for product in products:
-            row = {
-                'Name': product.get('name', ''),
-                'Kategorie': product.get('category', ''),
-                'Unterkategorie': product.get('subcategory', ''),
-                'SKU': product.get('sku_base', ''),
-                'Status': product.get('status', ''),
-            }
-            
-            if include_specs:
-                # Add category-specific specs
-                if product.get('category') in ['MR', 'Catalyst AP']:
-                    row['Wi-Fi Standard'] = product.get('wifi_standard', '')
-                    row['Max. Data Rate'] = product.get('max_data_rate', '')
-                    row['PoE Anforderung'] = product.get('poe_requirement', '')
-                    row['Empf. Clients'] = product.get('recommended_clients', '')
-                
-                elif product.get('category') == 'MX':
-                    row['Firewall Throughput'] = product.get('firewall_throughput', '')
-                    row['VPN Throughput'] = product.get('vpn_throughput', '')
-                    row['Max VPN Tunnel'] = product.get('max_vpn_tunnels', '')
-                    row['Empf. User'] = product.get('recommended_users', '')
-                
-                elif product.get('category') in ['MS', 'Catalyst Switch']:
-                    row['Ports Gesamt'] = product.get('total_ports', '')
-                    row['PoE Ports'] = product.get('poe_ports', 0)
-                    row['PoE Budget'] = product.get('poe_budget', '')
-                    row['Stacking'] = product.get('stacking', '')
-                
-                elif product.get('category') == 'ISE':
-                    row['Deployment Typ'] = product.get('deployment_type', '')
-                    row['Max. Endpoints'] = product.get('recommended_endpoints', '')
-                    row['CPU'] = product.get('cpu', '')
-                    row['RAM'] = product.get('ram', '')
-            
-            row['EOL Datum'] = product.get('eos_date', '')
-            row['Datasheet URL'] = product.get('datasheet_url', '')
+            spec = ()
+            if spec_width:
+                spec = [None] * spec_width
+                category = product.get('category')
+                if category in offsets:
+                    values = _SPEC_EXTRACTORS[category](product)
+                    offset = offsets[category]
+                    spec[offset:offset + len(values)] = values
+                spec = tuple(spec)
             
-            data.append(row)
-        
-        return data
+            yield (
+                product.get('name', ''),
+                product.get('category', ''),
+                product.get('subcategory', ''),
+                product.get('sku_base', ''),
+                product.get('status', ''),
+            ) + spec + (
+                product.get('eos_date', ''),
+                product.get('datasheet_url', ''),
+            )
     
-    def _prepare_license_data(self, products: List[Dict]) -> List[Dict]:
-        """Prepare license data for Excel export"""
-        data = []
-        
+    def _prepare_license_rows(self, products: List[Dict]) -> Iterator[tuple]:
+        """Yield license rows for Excel export, in the order of _LICENSE_HEADER"""
         for product in products:
-            licenses = product.get('sku_licenses', {})
+            licenses = product.get('sku_licenses')
             if licenses:
+                name = product.get('name', '')
+                sku_base = product.get('sku_base', '')
                 for license_type, sku in licenses.items():
-                    data.append({
-                        'Produkt': product.get('name', ''),
-                        'Produkt SKU': product.get('sku_base', ''),
-                        'Lizenz-Typ': license_type.replace('_', ' ').title(),
-                        'Lizenz SKU': sku
-                    })
-        
-        return data
+                    yield (name, sku_base, license_type.replace('_', ' ').title(), sku)
     
-    def _prepare_accessory_data(self, products: List[Dict]) -> List[Dict]:
-        """Prepare accessory data for Excel export"""
-        data = []
-        
+    def _prepare_accessory_rows(self, products: List[Dict]) -> Iterator[tuple]:
+        """Yield accessory rows for Excel export, in the order of _ACCESSORY_HEADER"""
         for product in products:
-            accessories = product.get('accessories', [])
+            accessories = product.get('accessories')
             if accessories:
+                name = product.get('name', '')
+                sku = product.get('sku_base', '')
                 for acc_id in accessories:
-                    data.append({
-                        'Produkt': product.get('name', ''),
-                        'Produkt SKU': product.get('sku_base', ''),
-                        'Zubehör ID': acc_id
-                    })
-        
-        return data
+                    yield (name, sku, acc_id)
     
     def _prepare_project_summary(self, project_name: str, items: List[Dict]) -> List[Dict]:
         """Prepare project summary"""
@@ -414,20 +536,22 @@ class ExportManager:
         data = [['Name', 'Kategorie', 'SKU', 'Wichtige Specs', 'Status']]
         
         for product in products:
+            category = product.get('category')
+            
             # Category-specific key specs
             specs = ""
-            if product.get('category') in ['MR', 'Catalyst AP']:
+            if category in _AP_CATEGORIES:
                 specs = f"{product.get('wifi_standard', '')}, {product.get('poe_requirement', '')}"
-            elif product.get('category') == 'MX':
+            elif category == 'MX':
                 specs = f"FW: {product.get('firewall_throughput', '')}, VPN: {product.get('vpn_throughput', '')}"
-            elif product.get('category') in ['MS', 'Catalyst Switch']:
+            elif category in _SWITCH_CATEGORIES:
                 specs = f"{product.get('total_ports', '')} Ports, PoE: {product.get('poe_budget', '0W')}"
-            elif product.get('category') == 'ISE':
+            elif category == 'ISE':
                 specs = f"{product.get('recommended_endpoints', '')}"
             
             data.append([
                 product.get('name', ''),
-                product.get('category', ''),
+                category if category is not None else '',
                 product.get('sku_base', ''),
                 specs,
                 product.get('status', '')
@@ -435,49 +559,62 @@ class ExportManager:
         
         return data
     
-    def _format_excel_worksheets(self, writer):
-        """Format Excel worksheets with styling"""
-        workbook = writer.book
-        
-        for sheet_name in workbook.sheetnames:
-            worksheet = workbook[sheet_name]
-            
-            # Header formatting
-            for cell in worksheet[1]:
-                cell.font = cell.font.copy(bold=True, color='FFFFFF')
-                cell.fill = cell.fill.copy(fgColor='0066CC', patternType='solid')
-                cell.alignment = cell.alignment.copy(horizontal='center')
-            
-            # Auto-adjust column widths
-            for column in worksheet.columns:
-                max_length = 0
-                column_letter = column[0].column_letter
-                
-                for cell in column:
-                    try:
-                        if len(str(cell.value)) > max_length:
-                            max_length = len(str(cell.value))
-                    except:
-                        pass
-                
-                adjusted_width = min(max_length + 2, 50)
-                worksheet.column_dimensions[column_letter].width = adjusted_width
+    @staticmethod
+    def _dict_rows(records: List[Dict]) -> Tuple[List[str], List[tuple]]:
+        """Split dict records into a header (keys in first-seen order) and row tuples"""
+        header = list(dict.fromkeys(key for record in records for key in record))
+        rows = [tuple(record.get(key) for key in header) for record in records]
+        return header, rows
+    
+    def _write_sheet(
+        self,
+        workbook: Workbook,
+        sheet_name: str,
+        header: Sequence[str],
+        rows: Iterable[Sequence],
+        title: Optional[str] = None
+    ):
+        """Write a styled header and rows to a write-only sheet, sizing columns to their content"""
+        worksheet = workbook.create_sheet(sheet_name)
+        rows = list(rows)
+        
+        # Column widths (write-only sheets need them before the first row is written)
+        max_widths = [len(str(h)) for h in header]
+        for row in rows:
+            for i, value in enumerate(row):
+                if value is None:
+                    continue
+                length = len(value) if isinstance(value, str) else len(str(value))
+                if length > max_widths[i]:
+                    max_widths[i] = length
+        
+        for i, width in enumerate(max_widths, start=1):
+            worksheet.column_dimensions[get_column_letter(i)].width = min(width + 2, _MAX_COLUMN_WIDTH)
+        
+        if title:
+            title_cell = WriteOnlyCell(worksheet, value=title)
+            title_cell.font = _TITLE_FONT
+            worksheet.append([title_cell])
+        
+        if header:
+            worksheet.append([self._header_cell(worksheet, h) for h in header])
+        
+        for row in rows:
+            worksheet.append(row)
     
-    def _format_bom_worksheets(self, writer, project_name: str):
-        """Format BOM worksheets"""
-        self._format_excel_worksheets(writer)
-        
-        # Add project name to header
-        workbook = writer.book
-        if 'Stückliste' in workbook.sheetnames:
-            worksheet = workbook['Stückliste']
-            worksheet.insert_rows(1)
-            worksheet['A1'] = f"Projekt: {project_name}"
-            worksheet['A1'].font = worksheet['A1'].font.copy(bold=True, size=14)
+    @staticmethod
+    def _header_cell(worksheet, value: str) -> WriteOnlyCell:
+        """Header cell with the shared header styling"""
+        cell = WriteOnlyCell(worksheet, value=value)
+        cell.font = _HEADER_FONT
+        cell.fill = _HEADER_FILL
+        cell.alignment = _HEADER_ALIGNMENT
+        return cell
 
 
 # Global instance
+@st.cache_resource
 def get_export_manager():
-    """Get ExportManager instance"""
+    """Get cached ExportManager instance"""
     return ExportManager()
 
@@ -3,7 +3,120 @@ Filter Functions for Product Catalog
 """
 
 import streamlit as st
-from typing import List, Dict, Optional
+import numpy as np
+from functools import lru_cache
+from typing import Callable, List, Dict, Optional, Tuple
+
+# Numba (optional) JIT-compiles the numeric filter mask
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Filters that compare a product field for equality (skipped when "All")
+_EXACT_MATCH_FIELDS = (
+    'category', 'subcategory', 'wifi_standard', 'poe_requirement',
+    'deployment_type', 'recommended_endpoints', 'status'
+)
+
+# Predicate used when no filter is active
+_ALWAYS_TRUE = lambda p: True
+
+# Catalog size from which throughput/port filters run as an array mask
+_NUMERIC_MASK_MIN_PRODUCTS = 1000
+
+
+def _numeric_mask_numpy(fw_gbps, ports, min_fw, port_target):
+    """Products passing the throughput/port filters (min_fw 0 / port_target -1: no filter)"""
+    mask = np.ones(fw_gbps.shape[0], dtype=np.bool_)
+    if min_fw > 0:
+        mask &= fw_gbps >= min_fw
+    if port_target >= 0:
+        mask &= ports == port_target
+    return mask
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _numeric_mask(fw_gbps, ports, min_fw, port_target):
+        """Products passing the throughput/port filters (compiled loop)"""
+        out = np.ones(fw_gbps.shape[0], dtype=np.bool_)
+        for i in range(fw_gbps.shape[0]):
+            if min_fw > 0 and fw_gbps[i] < min_fw:
+                out[i] = False
+            elif port_target >= 0 and ports[i] != port_target:
+                out[i] = False
+        return out
+    
+    # Compile (or load from cache) at import so the first real call skips it
+    _numeric_mask(np.zeros(1), np.zeros(1, dtype=np.int32), 0.0, -1)
+else:
+    _numeric_mask = _numeric_mask_numpy
+
+
+@st.cache_data(show_spinner=False)
+def _cached_unique(_product_loader, field: str, cat_key: Optional[str], version: int) -> List[str]:
+    """Unique field values for filter dropdowns (version invalidates after catalog changes)"""
+    return _product_loader.get_unique_values(field, cat_key)
+
+
+@lru_cache(maxsize=4096)
+def _parse_gbps(value) -> float:
+    """Parse a throughput like '7.5 Gbps' or '700 Mbps' into Gbps (cached per raw value)"""
+    if isinstance(value, (int, float)):
+        return float(value)
+    if not value:
+        return 0.0
+    
+    text = str(value).strip()
+    scale = 1.0
+    if text.endswith('Mbps'):
+        text, scale = text[:-4], 0.001
+    elif text.endswith('Gbps'):
+        text = text[:-4]
+    
+    try:
+        return float(text) * scale
+    except ValueError:
+        return 0.0
+
+
+def _throughput_gbps(product: Dict) -> float:
+    """Firewall throughput in Gbps (the shared product dict is left untouched)"""
+    value = product.get('firewall_throughput')
+    if isinstance(value, (list, dict)):
+        return 0.0
+    return _parse_gbps(value)
+
+
+def _port_count(product: Dict) -> int:
+    """Total port count as int (-1 when missing or not an integer)"""
+    value = product.get('total_ports')
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    return -1
+
+
+@st.cache_resource(show_spinner=False)
+def _numeric_columns(_product_loader, version: int) -> Tuple[np.ndarray, np.ndarray, List]:
+    """Throughput (Gbps) and port count arrays plus the product IDs of their rows (get_all_products() order)"""
+    products = _product_loader.get_all_products()
+    fw_gbps = np.fromiter((_throughput_gbps(p) for p in products), dtype=np.float64, count=len(products))
+    ports = np.fromiter((_port_count(p) for p in products), dtype=np.int32, count=len(products))
+    ids = [p.get('id') for p in products]
+    return fw_gbps, ports, ids
+
+
+def _rows_match(products: List[Dict], ids: List) -> bool:
+    """True if products are exactly the rows the numeric columns were built from, in the same order"""
+    return len(products) == len(ids) and all(p.get('id') == i for p, i in zip(products, ids))
+
+
+def get_numeric_columns(product_loader) -> Tuple[np.ndarray, np.ndarray, List]:
+    """Numeric filter columns for apply_filters (rebuilt when the catalog version changes)"""
+    return _numeric_columns(product_loader, product_loader.version)
+
 
 def create_filter_sidebar(product_loader, category: Optional[str] = None) -> Dict:
     """
@@ -32,195 +145,206 @@ def create_filter_sidebar(product_loader, category: Optional[str] = None) -> Dic
         cat_key = filters['category'].lower().replace(" ", "_")
         products = product_loader.get_products_by_category(cat_key)
     
-    # Dynamic filters based on category
-    if filters['category'] in ["MR", "Catalyst AP"]:
-        # Wi-Fi Access Point Filters
-        subcategories = product_loader.get_unique_values('subcategory', 
-            None if filters['category'] == "All" else filters['category'].lower().replace(" ", "_"))
-        if subcategories:
-            filters['subcategory'] = st.sidebar.selectbox(
-                "Einsatzbereich",
-                ["All"] + subcategories,
-                index=0
+    version = product_loader.version
+    
+    # Remaining filters are submitted together (one rerun per change set)
+    with st.sidebar.form('product_filters', clear_on_submit=False):
+        # Dynamic filters based on category
+        if filters['category'] in ["MR", "Catalyst AP"]:
+            # Wi-Fi Access Point Filters
+            subcategories = _cached_unique(product_loader, 'subcategory', cat_key, version)
+            if subcategories:
+                filters['subcategory'] = st.selectbox(
+                    "Einsatzbereich",
+                    ["All"] + subcategories,
+                    index=0
+                )
+            
+            wifi_standards = _cached_unique(product_loader, 'wifi_standard', cat_key, version)
+            if wifi_standards:
+                filters['wifi_standard'] = st.selectbox(
+                    "Wi-Fi Standard",
+                    ["All"] + wifi_standards,
+                    index=0
+                )
+            
+            poe_requirements = _cached_unique(product_loader, 'poe_requirement', cat_key, version)
+            if poe_requirements:
+                filters['poe_requirement'] = st.selectbox(
+                    "PoE Anforderung",
+                    ["All"] + poe_requirements,
+                    index=0
+                )
+        
+        elif filters['category'] in ["MX"]:
+            # Firewall Filters
+            subcategories = _cached_unique(product_loader, 'subcategory', 'mx', version)
+            if subcategories:
+                filters['subcategory'] = st.selectbox(
+                    "Deployment-Größe",
+                    ["All"] + subcategories,
+                    index=0
+                )
+            
+            # Throughput slider
+            st.markdown("**Firewall Throughput (Gbps)**")
+            throughput_min = st.number_input(
+                "Minimum (Gbps)",
+                min_value=0.0,
+                max_value=10.0,
+                value=0.0,
+                step=0.5
             )
+            if throughput_min > 0:
+                filters['min_throughput'] = throughput_min
         
-        wifi_standards = product_loader.get_unique_values('wifi_standard',
-            None if filters['category'] == "All" else filters['category'].lower().replace(" ", "_"))
-        if wifi_standards:
-            filters['wifi_standard'] = st.sidebar.selectbox(
-                "Wi-Fi Standard",
-                ["All"] + wifi_standards,
+        elif filters['category'] in ["MS", "Catalyst Switch"]:
+            # Switch Filters
+            subcategories = _cached_unique(product_loader, 'subcategory', cat_key, version)
+            if subcategories:
+                filters['subcategory'] = st.selectbox(
+                    "Switch-Typ",
+                    ["All"] + subcategories,
+                    index=0
+                )
+            
+            # Port count
+            st.markdown("**Port-Anzahl**")
+            port_options = ["All", "8", "24", "48", "16", "32"]
+            filters['port_count'] = st.selectbox(
+                "Ports",
+                port_options,
                 index=0
             )
-        
-        poe_requirements = product_loader.get_unique_values('poe_requirement',
-            None if filters['category'] == "All" else filters['category'].lower().replace(" ", "_"))
-        if poe_requirements:
-            filters['poe_requirement'] = st.sidebar.selectbox(
-                "PoE Anforderung",
-                ["All"] + poe_requirements,
+            
+            # PoE Support
+            filters['poe_support'] = st.selectbox(
+                "PoE Unterstützung",
+                ["All", "Ja", "Nein"],
                 index=0
             )
-    
-    elif filters['category'] in ["MX"]:
-        # Firewall Filters
-        subcategories = product_loader.get_unique_values('subcategory', 'mx')
-        if subcategories:
-            filters['subcategory'] = st.sidebar.selectbox(
-                "Deployment-Größe",
-                ["All"] + subcategories,
+            
+            # Stacking
+            filters['stacking'] = st.selectbox(
+                "Stacking",
+                ["All", "Ja", "Nein"],
                 index=0
             )
         
-        # Throughput slider
-        st.sidebar.markdown("**Firewall Throughput (Gbps)**")
-        throughput_min = st.sidebar.number_input(
-            "Minimum (Gbps)",
-            min_value=0.0,
-            max_value=10.0,
-            value=0.0,
-            step=0.5
-        )
-        if throughput_min > 0:
-            filters['min_throughput'] = throughput_min
-    
-    elif filters['category'] in ["MS", "Catalyst Switch"]:
-        # Switch Filters
-        subcategories = product_loader.get_unique_values('subcategory',
-            'ms' if filters['category'] == "MS" else 'catalyst_switch')
-        if subcategories:
-            filters['subcategory'] = st.sidebar.selectbox(
-                "Switch-Typ",
-                ["All"] + subcategories,
+        elif filters['category'] == "ISE":
+            # ISE Filters
+            deployment_types = _cached_unique(product_loader, 'deployment_type', 'ise', version)
+            if deployment_types:
+                filters['deployment_type'] = st.selectbox(
+                    "Deployment-Typ",
+                    ["All"] + deployment_types,
+                    index=0
+                )
+            
+            # Endpoint count
+            st.markdown("**Max. Endpoints**")
+            endpoint_options = ["All", "Up to 5,000", "Up to 50,000", "Up to 100,000", "Up to 200,000", "Up to 500,000"]
+            filters['recommended_endpoints'] = st.selectbox(
+                "Empfohlene Endpoints",
+                endpoint_options,
                 index=0
             )
         
-        # Port count
-        st.sidebar.markdown("**Port-Anzahl**")
-        port_options = ["All", "8", "24", "48", "16", "32"]
-        filters['port_count'] = st.sidebar.selectbox(
-            "Ports",
-            port_options,
-            index=0
-        )
+        # Common Filters
+        st.markdown("---")
         
-        # PoE Support
-        filters['poe_support'] = st.sidebar.selectbox(
-            "PoE Unterstützung",
-            ["All", "Ja", "Nein"],
+        # Status Filter
+        filters['status'] = st.selectbox(
+            "Status",
+            ["All", "Active", "EOL Announced"],
             index=0
         )
         
-        # Stacking
-        filters['stacking'] = st.sidebar.selectbox(
-            "Stacking",
-            ["All", "Ja", "Nein"],
-            index=0
-        )
-    
-    elif filters['category'] == "ISE":
-        # ISE Filters
-        deployment_types = product_loader.get_unique_values('deployment_type', 'ise')
-        if deployment_types:
-            filters['deployment_type'] = st.sidebar.selectbox(
-                "Deployment-Typ",
-                ["All"] + deployment_types,
-                index=0
-            )
-        
-        # Endpoint count
-        st.sidebar.markdown("**Max. Endpoints**")
-        endpoint_options = ["All", "Up to 5,000", "Up to 50,000", "Up to 100,000", "Up to 200,000", "Up to 500,000"]
-        filters['recommended_endpoints'] = st.sidebar.selectbox(
-            "Empfohlene Endpoints",
-            endpoint_options,
-            index=0
-        )
-    
-    # Common Filters
-    st.sidebar.markdown("---")
-    
-    # Status Filter
-    filters['status'] = st.sidebar.selectbox(
-        "Status",
-        ["All", "Active", "EOL Announced"],
-        index=0
-    )
-    
-    # Search
-    st.sidebar.markdown("---")
-    search_query = st.sidebar.text_input("🔎 Suche", placeholder="Name, SKU, ID...")
-    if search_query:
-        filters['search'] = search_query
+        # Search
+        st.markdown("---")
+        search_query = st.text_input("🔎 Suche", placeholder="Name, SKU, ID...")
+        if search_query:
+            filters['search'] = search_query
+            
+        st.form_submit_button("Anwenden", use_container_width=True)
     
     return filters
 
 
-def apply_filters(products: List[Dict], filters: Dict) -> List[Dict]:
-    """Apply filters to product list"""
-    filtered = products.copy()
-    
-    # Category filter
-    if filters.get('category') and filters['category'] != "All":
-        filtered = [p for p in filtered if p.get('category') == filters['category']]
-    
-    # Subcategory filter
-    if filters.get('subcategory') and filters['subcategory'] != "All":
-        filtered = [p for p in filtered if p.get('subcategory') == filters['subcategory']]
-    
-    # Wi-Fi Standard filter
-    if filters.get('wifi_standard') and filters['wifi_standard'] != "All":
-        filtered = [p for p in filtered if p.get('wifi_standard') == filters['wifi_standard']]
+def _build_predicate(filters: Dict, include_numeric: bool = True) -> Callable[[Dict], bool]:
+    """Compile the active filters into a single product predicate (include_numeric: throughput/ports)"""
+    checks = []
     
-    # PoE Requirement filter
-    if filters.get('poe_requirement') and filters['poe_requirement'] != "All":
-        filtered = [p for p in filtered if p.get('poe_requirement') == filters['poe_requirement']]
+    # Exact-match filters
+    exact = tuple(
+        (field, filters[field]) for field in _EXACT_MATCH_FIELDS
+        if filters.get(field) and filters[field] != "All"
+    )
+    if exact:
+        checks.append(lambda p: all(p.get(field) == value for field, value in exact))
     
     # Throughput filter (MX)
-    if filters.get('min_throughput'):
-        filtered = [p for p in filtered 
-                   if float(p.get('firewall_throughput', '0').replace(' Gbps', '').replace(' Mbps', '')) 
-                   >= filters['min_throughput']]
+    if include_numeric and filters.get('min_throughput'):
+        min_throughput = filters['min_throughput']
+        checks.append(lambda p: _throughput_gbps(p) >= min_throughput)
     
     # Port count filter
-    if filters.get('port_count') and filters['port_count'] != "All":
+    if include_numeric and filters.get('port_count') and filters['port_count'] != "All":
         port_count = int(filters['port_count'])
-        filtered = [p for p in filtered if p.get('total_ports') == port_count]
+        checks.append(lambda p: p.get('total_ports') == port_count)
     
     # PoE Support filter
     if filters.get('poe_support') and filters['poe_support'] != "All":
         has_poe = filters['poe_support'] == "Ja"
-        filtered = [p for p in filtered 
-                   if (p.get('poe_ports', 0) > 0) == has_poe or 
-                   (p.get('poe_support') == "Yes") == has_poe]
+        checks.append(lambda p: (p.get('poe_ports', 0) > 0) == has_poe or
+                      (p.get('poe_support') == "Yes") == has_poe)
     
     # Stacking filter
     if filters.get('stacking') and filters['stacking'] != "All":
         has_stacking = filters['stacking'] == "Ja"
-        filtered = [p for p in filtered 
-                   if (p.get('stacking') == "Yes") == has_stacking or
-                   (p.get('stacking') is True) == has_stacking]
-    
-    # Deployment type filter (ISE)
-    if filters.get('deployment_type') and filters['deployment_type'] != "All":
-        filtered = [p for p in filtered if p.get('deployment_type') == filters['deployment_type']]
-    
-    # Endpoint count filter (ISE)
-    if filters.get('recommended_endpoints') and filters['recommended_endpoints'] != "All":
-        filtered = [p for p in filtered 
-                   if p.get('recommended_endpoints') == filters['recommended_endpoints']]
-    
-    # Status filter
-    if filters.get('status') and filters['status'] != "All":
-        filtered = [p for p in filtered if p.get('status') == filters['status']]
+        checks.append(lambda p: (p.get('stacking') == "Yes") == has_stacking or
+                      (p.get('stacking') is True) == has_stacking)
     
     # Search filter
     if filters.get('search'):
         query = filters['search'].lower()
-        filtered = [p for p in filtered 
-                   if query in p.get('name', '').lower() or
-                   query in p.get('id', '').lower() or
-                   query in p.get('sku_base', '').lower()]
+        checks.append(lambda p: query in p.get('name', '').lower() or
+                      query in p.get('id', '').lower() or
+                      query in p.get('sku_base', '').lower())
     
-    return filtered
+    if not checks:
+        return _ALWAYS_TRUE
+    if len(checks) == 1:
+        return checks[0]
+    return lambda p: all(check(p) for check in checks)
 
+
+def apply_filters(
+    products: List[Dict],
+    filters: Dict,
+    numeric_columns: Optional[Tuple[np.ndarray, np.ndarray, List]] = None
+) -> List[Dict]:
+    """
+    Apply filters to product list (returns the input list itself when no filter is active)
+    
+    numeric_columns: get_numeric_columns() result; when its rows are exactly these
+    products (checked by ID), large catalogs run the throughput/port filters as one array mask
+    """
+    include_numeric = True
+    
+    if numeric_columns is not None and len(products) >= _NUMERIC_MASK_MIN_PRODUCTS:
+        fw_gbps, ports, ids = numeric_columns
+        min_fw = float(filters.get('min_throughput') or 0.0)
+        port_target = -1
+        if filters.get('port_count') and filters['port_count'] != "All":
+            port_target = int(filters['port_count'])
+        
+        if (min_fw > 0 or port_target >= 0) and _rows_match(products, ids):
+            mask = _numeric_mask(fw_gbps, ports, min_fw, port_target)
+            products = [products[i] for i in np.flatnonzero(mask)]
+            include_numeric = False
+    
+    predicate = _build_predicate(filters, include_numeric)
+    if predicate is _ALWAYS_TRUE:
+        return products
+    return [p for p in products if predicate(p)]
@@ -7,6 +7,9 @@ import firebase_admin
 from firebase_admin import credentials, firestore, auth
 import json
 
+# Set once the initial admin is known to exist (skips all further checks)
+_ADMIN_INIT_DONE = False
+
 def initialize_firebase():
     """Initialize Firebase Admin SDK"""
     try:
@@ -17,11 +20,11 @@ def initialize_firebase():
         firebase_creds = dict(st.secrets["firebase"])
         cred = credentials.Certificate(firebase_creds)
         firebase_admin.initialize_app(cred)
-    
-    return firestore.client()
 
+@st.cache_resource
 def get_db():
-    """Get Firestore database instance"""
+    """Get cached Firestore database instance (initializes the app on first use)"""
+    initialize_firebase()
     return firestore.client()
 
 def create_initial_admin():
@@ -29,25 +32,26 @@ def create_initial_admin():
     Create initial admin user in Firestore if not exists
     Called once during setup
     """
+    global _ADMIN_INIT_DONE
+    
+    if _ADMIN_INIT_DONE:
+        return False
+    
     db = get_db()
     users_ref = db.collection('users')
     
-    # Check if admin exists
-    admin_query = users_ref.where('username', '==', st.secrets["admin"]["username"]).limit(1).get()
-    
+    # Check if admin exists (empty projection: only document names come back, not the user data)
+    admin_query = users_ref.where('username', '==', st.secrets["admin"]["username"]).select([]).limit(1).get()
     if not admin_query:
-        import bcrypt
+        from utils.auth import hash_password
         
-        # Hash password
-        hashed_pw = bcrypt.hashpw(
-            st.secrets["admin"]["password"].encode('utf-8'),
-            bcrypt.gensalt()
-        )
+        # Hash password (same bcrypt cost as regular accounts)
+        hashed_pw = hash_password(st.secrets["admin"]["password"])
         
         # Create admin user
         admin_data = {
             'username': st.secrets["admin"]["username"],
-            'password': hashed_pw.decode('utf-8'),
+            'password': hashed_pw,
             'role': 'admin',
             'email': 'admin@example.com',
             'created_at': firestore.SERVER_TIMESTAMP,
@@ -56,7 +60,14 @@ def create_initial_admin():
             'language': 'de'
         }
         
-        users_ref.add(admin_data)
+        _, admin_ref = users_ref.add(admin_data)
+        
+        # Username index for direct lookups on login (exact-case key, same scheme as get_user_id)
+        db.collection('usernames').document(admin_data['username']).set({'uid': admin_ref.id})
+        
+        _ADMIN_INIT_DONE = True
         return True
+    
+    _ADMIN_INIT_DONE = True
     return False
 
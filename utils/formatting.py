@@ -0,0 +1,53 @@
+"""
+Date Formatting Helpers
+Shared by the page scripts; kept in a module so memoized results survive Streamlit reruns
+"""
+
+import time
+from datetime import datetime
+from functools import lru_cache
+
+
+@lru_cache(maxsize=1024)
+def format_date(date_str):
+    """Format ISO date string to readable format (memoized, inputs are immutable ISO strings)"""
+    if not date_str:
+        return "N/A"
+    
+    try:
+        dt = datetime.fromisoformat(date_str)
+        return dt.strftime("%d.%m.%Y")
+    except:
+        return date_str
+
+
+def format_relative_date(date_str):
+    """Format ISO date string relative to now ("vor 5 Minuten", "Gestern", ...)"""
+    if not date_str:
+        return "N/A"
+    
+    # Relative dates only change per minute, so cache per (date, minute)
+    return _format_relative_date_cached(date_str, int(time.time() // 60))
+
+
+@lru_cache(maxsize=2048)
+def _format_relative_date_cached(date_str, minute_bucket):
+    """Format ISO date string relative to now (minute_bucket only keys the cache)"""
+    try:
+        dt = datetime.fromisoformat(date_str)
+        now = datetime.now()
+        diff = now - dt
+        
+        if diff.days == 0:
+            if diff.seconds < 3600:
+                return f"vor {diff.seconds // 60} Minuten"
+            else:
+                return f"vor {diff.seconds // 3600} Stunden"
+        elif diff.days == 1:
+            return "Gestern"
+        elif diff.days < 7:
+            return f"vor {diff.days} Tagen"
+        else:
+            return dt.strftime("%d.%m.%Y")
+    except:
+        return date_str
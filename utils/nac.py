@@ -0,0 +1,203 @@
+"""
+NAC Recommendation Scoring
+Wizard answer encoding and ISE vs Meraki scoring for the NAC Solutions page
+"""
+
+from dataclasses import dataclass, field
+from enum import IntEnum
+from functools import lru_cache
+
+
+class OrgSize(IntEnum):
+    XS = 0  # < 100
+    S = 1   # 100 - 500
+    M = 2   # 500 - 2.000
+    L = 3   # 2.000 - 10.000
+    XL = 4  # > 10.000
+
+
+class Infra(IntEnum):
+    MERAKI = 0
+    MERAKI_CATALYST = 1
+    MULTI_VENDOR = 2
+    CATALYST = 3
+
+
+class Level(IntEnum):
+    LOW = 0
+    MEDIUM = 1
+    HIGH = 2
+
+
+class Deployment(IntEnum):
+    CLOUD = 0
+    ON_PREM = 1
+    HYBRID = 2
+
+
+@dataclass(frozen=True, slots=True)
+class WizardAnswers:
+    """Wizard answers; -1 marks an unanswered question"""
+    org_size: int = -1
+    infrastructure: int = -1
+    use_cases: frozenset = field(default_factory=frozenset)
+    complexity: int = -1
+    it_resources: int = -1
+    deployment: int = -1
+    compliance: int = -1
+
+
+# Wizard radio labels -> integer codes (stored in wizard_answers instead of the label)
+OPTION_CODES = {
+    # Step 1: Organization size
+    "< 100": OrgSize.XS,
+    "100 - 500": OrgSize.S,
+    "500 - 2.000": OrgSize.M,
+    "2.000 - 10.000": OrgSize.L,
+    "> 10.000": OrgSize.XL,
+    # Step 2: Infrastructure
+    "100% Cisco Meraki": Infra.MERAKI,
+    "Meraki + Catalyst": Infra.MERAKI_CATALYST,
+    "Multi-Vendor (Cisco, HP, Aruba, etc.)": Infra.MULTI_VENDOR,
+    "Nur Catalyst/Traditional Cisco": Infra.CATALYST,
+    # Step 4: Complexity
+    "Einfach - Basis-Policies (Mitarbeiter/Gäste)": Level.LOW,
+    "Mittel - Rollenbasiert (mehrere User-Gruppen)": Level.MEDIUM,
+    "Komplex - Granular (Device Type, Location, Time, Posture)": Level.HIGH,
+    # Step 5: IT resources
+    "Klein - 1-2 Admins, wenig NAC-Erfahrung": Level.LOW,
+    "Mittel - Dediziertes Team, Basis-Erfahrung": Level.MEDIUM,
+    "Groß - Erfahrenes Security-Team, ISE-Know-how": Level.HIGH,
+    # Step 6: Deployment model
+    "Cloud - Keine On-Prem Hardware, Cloud-Managed": Deployment.CLOUD,
+    "On-Premises - Volle Kontrolle, lokale Appliances": Deployment.ON_PREM,
+    "Hybrid - Mix aus Cloud & On-Prem": Deployment.HYBRID,
+    # Step 7: Compliance
+    "Keine besonderen Anforderungen": Level.LOW,
+    "Standard - Basis-Reporting ausreichend": Level.MEDIUM,
+    "Streng - Detaillierte Audits erforderlich (GDPR, HIPAA, PCI-DSS)": Level.HIGH,
+}
+
+
+def get_quick_recommendation(endpoints, complexity, vendor):
+    """Quick recommendation based on simple criteria"""
+    return _quick_recommendation(_endpoint_bucket(endpoints), complexity, vendor)
+
+
+def _endpoint_bucket(endpoints):
+    """Map endpoint count to a size bucket (S: <=500, M: <=2000, L: >2000)"""
+    if endpoints <= 500:
+        return 'S'
+    return 'M' if endpoints <= 2000 else 'L'
+
+
+@lru_cache(maxsize=32)
+def _quick_recommendation(bucket, complexity, vendor):
+    """Score quick recommendation inputs (at most 3 x 3 x 3 distinct keys)"""
+    
+    score_ise = 0
+    score_meraki = 0
+    
+    # Endpoints
+    if bucket == 'L':
+        score_ise += 3
+    elif bucket == 'M':
+        score_ise += 1
+        score_meraki += 1
+    else:
+        score_meraki += 2
+    
+    # Complexity
+    if complexity == "Komplex":
+        score_ise += 3
+    elif complexity == "Mittel":
+        score_ise += 1
+        score_meraki += 1
+    else:
+        score_meraki += 2
+    
+    # Vendor
+    if vendor == "Multi-Vendor":
+        score_ise += 3
+    elif vendor == "Nur Meraki":
+        score_meraki += 3
+    else:
+        score_ise += 1
+        score_meraki += 1
+    
+    return "ISE" if score_ise > score_meraki else "Meraki"
+
+
+def calculate_wizard_recommendation(answers):
+    """Calculate detailed recommendation from wizard answers"""
+    solution, confidence, reasons = _calculate_wizard_recommendation_cached(answers)
+    
+    return {
+        'solution': solution,
+        'confidence': confidence,
+        'reasons': list(reasons)
+    }
+
+
+# Wizard scoring rules: (answer key, matching values, ISE delta, Meraki delta, reason or None).
+# Rules for the same scalar key use disjoint value sets (if/elif semantics); -1 marks an
+# unanswered question. Multi-select answers match if any selected value is in the set.
+_WIZARD_RULES = (
+    # Org size
+    ('org_size', frozenset({OrgSize.L, OrgSize.XL}), 20, 0, "✅ Enterprise-Scale (>2k Endpoints) → ISE skaliert besser"),
+    ('org_size', frozenset({OrgSize.M}), 10, 5, None),
+    ('org_size', frozenset({OrgSize.XS, OrgSize.S, -1}), 0, 15, "✅ SMB-Scale (<500 Endpoints) → Meraki ausreichend"),
+    # Infrastructure
+    ('infrastructure', frozenset({Infra.MULTI_VENDOR}), 25, 0, "✅ Multi-Vendor Netzwerk → ISE unterstützt alle Hersteller"),
+    ('infrastructure', frozenset({Infra.MERAKI}), 0, 25, "✅ Pure Meraki Umgebung → Meraki SM nahtlos integriert"),
+    ('infrastructure', frozenset({Infra.CATALYST}), 15, 0, None),
+    # Use cases
+    ('use_cases', frozenset({"Security Group Tagging (TrustSec)"}), 30, 0, "✅ TrustSec (SGT) benötigt → Nur ISE unterstützt"),
+    ('use_cases', frozenset({"Device Administration (TACACS+)"}), 25, 0, "✅ TACACS+ Device Admin → Nur ISE unterstützt"),
+    ('use_cases', frozenset({"Mobile Device Management (MDM)"}), 0, 15, "✅ Native MDM-Integration → Meraki SM Vorteil"),
+    ('use_cases', frozenset({"Posture Assessment (Compliance Check)"}), 10, 0, None),
+    # Complexity
+    ('complexity', frozenset({Level.HIGH}), 20, 0, "✅ Komplexe Policies → ISE flexibler"),
+    ('complexity', frozenset({Level.LOW}), 0, 15, "✅ Einfache Policies → Meraki einfacher zu managen"),
+    # IT Resources
+    ('it_resources', frozenset({Level.HIGH}), 15, 0, "✅ Erfahrenes Team mit ISE-Know-how → ISE sinnvoll"),
+    ('it_resources', frozenset({Level.LOW}), 0, 20, "✅ Kleines Team ohne NAC-Erfahrung → Meraki einfacher"),
+    # Deployment (Hybrid also mentions Cloud and has always scored like Cloud)
+    ('deployment', frozenset({Deployment.CLOUD, Deployment.HYBRID}), 0, 20, "✅ Cloud-First Strategie → Meraki Cloud-Native"),
+    ('deployment', frozenset({Deployment.ON_PREM}), 15, 0, None),
+    # Compliance
+    ('compliance', frozenset({Level.HIGH}), 15, 0, "✅ Strikte Compliance → ISE detailliertere Audits"),
+)
+
+
+@lru_cache(maxsize=512)
+def _calculate_wizard_recommendation_cached(answers):
+    """Score wizard answers (memoized, WizardAnswers is frozen and hashable)"""
+    score_ise = 0
+    score_meraki = 0
+    reasons = []
+    
+    # Single pass over the rule table
+    for key, wanted, ise_delta, meraki_delta, reason in _WIZARD_RULES:
+        value = getattr(answers, key)
+        if isinstance(value, frozenset):
+            matched = not wanted.isdisjoint(value)
+        else:
+            matched = value in wanted
+        
+        if matched:
+            score_ise += ise_delta
+            score_meraki += meraki_delta
+            if reason:
+                reasons.append(reason)
+    
+    # Calculate confidence
+    total_score = score_ise + score_meraki
+    if score_ise > score_meraki:
+        confidence = int((score_ise / total_score) * 100)
+        solution = "ISE"
+    else:
+        confidence = int((score_meraki / total_score) * 100)
+        solution = "Meraki"
+    
+    return solution, confidence, tuple(reasons)
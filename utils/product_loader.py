@@ -5,24 +5,103 @@ Loads and manages product data from JSON files
 
 import json
 import os
-from typing import List, Dict, Optional
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+from typing import List, Dict, Optional, Tuple
+import numpy as np
+import pandas as pd
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+# orjson (optional) parses/serializes the catalog files faster than stdlib json
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+PRODUCT_FILES = (
+    "products_mr.json",
+    "products_mx.json",
+    "products_ms.json",
+    "products_mv.json",
+    "products_mt.json",
+    "products_catalyst_ap.json",
+    "products_catalyst_switch.json",
+    "products_ise.json"
+)
+ACCESSORIES_FILE = "accessories.json"
+
+# Fields matched by search_products; the separator never occurs in a query, so matches cannot span two fields
+_SEARCH_BLOB_FIELDS = ('name', 'id', 'sku_base', 'category')
+_SEARCH_BLOB_SEP = '\x00'
+
+
+def read_json_file(filepath: str):
+    """Read a JSON file (orjson when available)"""
+    if ORJSON_AVAILABLE:
+        with open(filepath, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(filepath, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def write_json_file(filepath: str, data):
+    """Write data as indented UTF-8 JSON (orjson when available)"""
+    if ORJSON_AVAILABLE:
+        with open(filepath, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        return
+    with open(filepath, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+def dumps_json(data) -> str:
+    """Serialize data as indented JSON text, with the same serializer and options as write_json_file"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode('utf-8')
+    return json.dumps(data, indent=2, ensure_ascii=False)
+
+
+def _replace_json_file(filepath: str, data):
+    """Write a JSON file atomically (temp file + os.replace), so readers never see a partial file"""
+    tmp_path = filepath + ".tmp"
+    write_json_file(tmp_path, data)
+    os.replace(tmp_path, filepath)
+
+
+@st.cache_data(show_spinner=False)
+def _load_json_file(filepath: str, mtime_ns: int, size: int) -> dict:
+    """Parse a JSON file (mtime/size are part of the cache key, so rewrites invalidate it)"""
+    return read_json_file(filepath)
+
 
 class ProductLoader:
     def __init__(self):
         self.data_dir = "data"
         self.products = {}
         self.accessories = []
-        self.load_all_products()
-        self.load_accessories()
+        self._all_products = []
+        self._category_keys = []
+        self._category_key_array = np.empty(0, dtype=object)
+        self._by_id = {}
+        self._category_by_id = {}
+        self._acc_by_id = {}
+        self._acc_by_product = {}
+        self._search_index = None  # (DataFrame, products) published together
+        self._index_lock = threading.Lock()
+        self._field_arrays = {}
+        self.version = 0
+        self.load_all_products(with_accessories=True)
     
-    @st.cache_data
-    def load_json_file(_self, filename: str) -> dict:
+    def load_json_file(self, filename: str) -> dict:
         """Load JSON file from data directory"""
-        filepath = os.path.join(_self.data_dir, filename)
+        filepath = os.path.join(self.data_dir, filename)
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            stat = os.stat(filepath)
+            return _load_json_file(filepath, stat.st_mtime_ns, stat.st_size)
         except FileNotFoundError:
             st.warning(f"⚠️ Datei nicht gefunden: {filename}")
             return {"products": []} if "products" in filename else {"accessories": []}
@@ -30,39 +109,88 @@ class ProductLoader:
             st.error(f"❌ JSON Fehler in {filename}: {str(e)}")
             return {"products": []} if "products" in filename else {"accessories": []}
     
-    def load_all_products(self):
-        """Load all product JSON files"""
-        product_files = [
-            "products_mr.json",
-            "products_mx.json",
-            "products_ms.json",
-            "products_mv.json",
-            "products_mt.json",
-            "products_catalyst_ap.json",
-            "products_catalyst_switch.json",
-            "products_ise.json"
-        ]
-        
-        for filename in product_files:
-            data = self.load_json_file(filename)
+    def load_json_files(self, filenames) -> List[dict]:
+        """Load several JSON files concurrently (results in the given order)"""
+        # Worker threads share the script context so cache and warnings keep working
+        ctx = get_script_run_ctx()
+        
+        def attach_ctx():
+            add_script_run_ctx(threading.current_thread(), ctx)
+        
+        with ThreadPoolExecutor(max_workers=len(filenames), initializer=attach_ctx) as executor:
+            return list(executor.map(self.load_json_file, filenames))
+    
+    def load_all_products(self, with_accessories: bool = False):
+        """Load all product JSON files (and accessories.json in the same batch)"""
+        filenames = PRODUCT_FILES + (ACCESSORIES_FILE,) if with_accessories else PRODUCT_FILES
+        results = self.load_json_files(filenames)
+        
+        if with_accessories:
+            self._set_accessories(results.pop())
+        
+        for filename, data in zip(PRODUCT_FILES, results):
             if "products" in data:
                 category_key = filename.replace("products_", "").replace(".json", "")
-                self.products[category_key] = data["products"]
+                self._set_category_products(category_key, data["products"])
+        
+        self._rebuild_indexes()
+    
+    def _set_category_products(self, category_key: str, products: List[Dict]):
+        """Take over the product list of one category file"""
+        # Interned category strings make the category compares in filters/exports cheap
+        for product in products:
+            if isinstance(product.get('category'), str):
+                product['category'] = sys.intern(product['category'])
+        self.products[category_key] = products
+    
+    def _rebuild_indexes(self):
+        """Rebuild the flat product list and ID index after product data changed"""
+        # Flat list plus a parallel list of category keys; the product dicts themselves stay untouched
+        all_products = list(chain.from_iterable(self.products.values()))
+        category_keys = [category for category, products in self.products.items() for _ in products]
+        
+        # ID indexes (first product wins on duplicate IDs, as in the old linear scan)
+        by_id = {}
+        category_by_id = {}
+        for product, category in zip(all_products, category_keys):
+            product_id = product.get('id')
+            if product_id not in by_id:
+                by_id[product_id] = product
+                category_by_id[product_id] = category
+        
+        # Publish together and invalidate search index, filter columns and version-keyed caches
+        # (the loader is shared by all sessions; _get_search_index snapshots under the same lock)
+        with self._index_lock:
+            self._all_products = all_products
+            self._category_keys = category_keys
+            self._category_key_array = np.array(category_keys, dtype=object)
+            self._by_id = by_id
+            self._category_by_id = category_by_id
+            self._search_index = None
+            self._field_arrays = {}
+            self.version += 1
     
     def load_accessories(self):
         """Load accessories data"""
-        data = self.load_json_file("accessories.json")
+        self._set_accessories(self.load_json_file(ACCESSORIES_FILE))
+    
+    def _set_accessories(self, data: dict):
+        """Take over loaded accessories data and rebuild the accessory indexes"""
         if "accessories" in data:
             self.accessories = data["accessories"]
+        
+        # ID index and product -> compatible accessories index
+        self._acc_by_id = {}
+        self._acc_by_product = {}
+        for accessory in self.accessories:
+            self._acc_by_id.setdefault(accessory.get('id'), accessory)
+            # As a set: an accessory listing a product twice is still indexed once
+            for product_id in frozenset(accessory.get('compatible_products', [])):
+                self._acc_by_product.setdefault(product_id, []).append(accessory)
     
     def get_all_products(self) -> List[Dict]:
-        """Get all products from all categories"""
-        all_products = []
-        for category, products in self.products.items():
-            for product in products:
-                product['_category_file'] = category
-                all_products.append(product)
-        return all_products
+        """Get all products from all categories (new list; callers may sort it)"""
+        return list(self._all_products)
     
     def get_products_by_category(self, category: str) -> List[Dict]:
         """Get products by category (MR, MX, MS, etc.)"""
@@ -70,40 +198,67 @@ class ProductLoader:
     
     def get_product_by_id(self, product_id: str) -> Optional[Dict]:
         """Get single product by ID"""
-        for products in self.products.values():
-            for product in products:
-                if product.get('id') == product_id:
-                    return product
-        return None
+        return self._by_id.get(product_id)
+    
+    def get_product_category_key(self, product_id: str) -> Optional[str]:
+        """Get the category key (data file suffix, e.g. 'mr') a product was loaded from"""
+        return self._category_by_id.get(product_id)
     
     def get_accessories_by_product(self, product_id: str) -> List[Dict]:
         """Get compatible accessories for a product"""
-        compatible = []
-        for accessory in self.accessories:
-            if product_id in accessory.get('compatible_products', []):
-                compatible.append(accessory)
-        return compatible
+        return list(self._acc_by_product.get(product_id, ()))
     
     def get_accessory_by_id(self, accessory_id: str) -> Optional[Dict]:
         """Get single accessory by ID"""
-        for accessory in self.accessories:
-            if accessory.get('id') == accessory_id:
-                return accessory
-        return None
+        return self._acc_by_id.get(accessory_id)
     
     def search_products(self, query: str) -> List[Dict]:
         """Search products by name, ID, or SKU"""
-        query = query.lower()
-        results = []
+        df, products = self._get_search_index()
+        q = query.lower()
+        
+        # One substring test per product against the prebuilt blob
+        mask = df['blob_lc'].str.contains(q, regex=False).to_numpy(dtype=bool)
         
-        for product in self.get_all_products():
-            if (query in product.get('name', '').lower() or
-                query in product.get('id', '').lower() or
-                query in product.get('sku_base', '').lower() or
-                query in product.get('category', '').lower()):
-                results.append(product)
+        return [products[i] for i in np.flatnonzero(mask)]
+    
+    def _get_search_index(self) -> Tuple[pd.DataFrame, List[Dict]]:
+        """(DataFrame of lowercased name/SKU columns and search blobs, products aligned with its rows)"""
+        index = self._search_index
+        if index is not None:
+            return index
+        
+        # Consistent snapshot of the catalog; the frame itself is built outside the lock
+        with self._index_lock:
+            version = self.version
+            all_products = self._all_products
+            category_keys = self._category_keys
+        
+        df = pd.DataFrame({
+            'name_lc': [str(p.get('name', '')).lower() for p in all_products],
+            'sku_lc': [str(p.get('sku_base', '')).lower() for p in all_products],
+            'blob_lc': [_SEARCH_BLOB_SEP.join(str(p.get(f, '')).lower() for f in _SEARCH_BLOB_FIELDS)
+                        for p in all_products],
+            'category': category_keys,
+        })
+        index = (df, all_products)
+        
+        # Publish only if the catalog did not change meanwhile (the result is still valid for this call)
+        with self._index_lock:
+            if self.version == version:
+                self._search_index = index
+        return index
+    
+    def search(self, query: str, category: Optional[str] = None, limit: int = 25) -> List[Dict]:
+        """Search products by name or SKU, optionally within one category (e.g. 'mr', 'catalyst_ap')"""
+        df, products = self._get_search_index()
+        q = query.lower()
+        
+        mask = df['name_lc'].str.contains(q, regex=False) | df['sku_lc'].str.contains(q, regex=False)
+        if category:
+            mask &= df['category'] == category.lower()
         
-        return results
+        return [products[i] for i in df.index[mask][:limit]]
     
     def filter_products(self, filters: Dict) -> List[Dict]:
         """
@@ -118,13 +273,34 @@ class ProductLoader:
             'status': 'Active'
         }
         """
-        results = self.get_all_products()
+        active = [(key, value) for key, value in filters.items() if value and value != "All"]
+        if not active:
+            return self.get_all_products()
         
-        for key, value in filters.items():
-            if value and value != "All":
-                results = [p for p in results if p.get(key) == value]
+        # One vectorized equality test per active filter over the cached field columns
+        mask = np.ones(len(self._all_products), dtype=bool)
+        for key, value in active:
+            mask &= self._field_array(key) == value
         
-        return results
+        # A category filter also restricts the result to that category's file
+        category = filters.get('category')
+        if category and category != "All":
+            category_key = category.lower().replace(" ", "_")
+            if category_key in self.products:
+                mask &= self._category_key_array == category_key
+        
+        return [self._all_products[i] for i in np.flatnonzero(mask)]
+    
+    def _field_array(self, field: str) -> np.ndarray:
+        """Column of one product field as an object array (built once per catalog version)"""
+        column = self._field_arrays.get(field)
+        if column is None:
+            # Element-wise fill: list-valued fields must not become extra array dimensions
+            column = np.empty(len(self._all_products), dtype=object)
+            for i, product in enumerate(self._all_products):
+                column[i] = product.get(field)
+            self._field_arrays[field] = column
+        return column
     
     def get_unique_values(self, field: str, category: Optional[str] = None) -> List[str]:
         """Get unique values for a field (for filter dropdowns)"""
@@ -149,30 +325,39 @@ class ProductLoader:
     
     def save_product(self, category: str, product: Dict):
         """Save/update a product to JSON file"""
+        self.save_products_bulk(category, [product])
+    
+    def save_products_bulk(self, category: str, products) -> int:
+        """Save/update several products of one category with a single file rewrite"""
         filename = f"products_{category.lower()}.json"
         filepath = os.path.join(self.data_dir, filename)
         
         # Load current data
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = read_json_file(filepath)
         
-        # Update or add product
-        product_exists = False
-        for i, p in enumerate(data['products']):
-            if p['id'] == product['id']:
+        # Update or add products
+        index_by_id = {p['id']: i for i, p in enumerate(data['products'])}
+        count = 0
+        for product in products:
+            i = index_by_id.get(product['id'])
+            if i is not None:
                 data['products'][i] = product
-                product_exists = True
-                break
+            else:
+                index_by_id[product['id']] = len(data['products'])
+                data['products'].append(product)
+            count += 1
+        
+        if not count:
+            return 0
         
-        if not product_exists:
-            data['products'].append(product)
+        # Save back to file (atomic replace)
+        _replace_json_file(filepath, data)
         
-        # Save back to file
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        # Only this category changed: take over the written data instead of reloading every file
+        self._set_category_products(category.lower(), data['products'])
+        self._rebuild_indexes()
         
-        # Reload products
-        self.load_all_products()
+        return count
     
     def delete_product(self, category: str, product_id: str):
         """Delete a product from JSON file"""
@@ -180,18 +365,17 @@ class ProductLoader:
         filepath = os.path.join(self.data_dir, filename)
         
         # Load current data
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = read_json_file(filepath)
         
         # Remove product
         data['products'] = [p for p in data['products'] if p['id'] != product_id]
         
-        # Save back to file
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        # Save back to file (atomic replace)
+        _replace_json_file(filepath, data)
         
-        # Reload products
-        self.load_all_products()
+        # Only this category changed
+        self._set_category_products(category.lower(), data['products'])
+        self._rebuild_indexes()
 
 
 # Global instance
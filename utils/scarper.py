@@ -3,24 +3,87 @@ Web Scraper for Cisco and Meraki Product Information
 Automatically fetches product specs, EOL dates, and SKUs from official sources
 """
 
+import io
+import json
+import threading
 import requests
+import pandas as pd
 from bs4 import BeautifulSoup
-import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from utils.product_loader import dumps_json, write_json_file
 import re
 from typing import Dict, List, Optional
 from datetime import datetime
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 
 class CiscoMerakiScraper:
     """Scrape product information from official Cisco and Meraki websites"""
     
+    # Precompiled patterns: model numbers (MR46, MS225-48FP, ...), MR models, license SKUs
+    _MODEL_RE = re.compile(r'(MR|MX|MS|MV|MT)\d+[A-Z]*(-\d+[A-Z]*)?')
+    _MR_RE = re.compile(r'MR\d+[A-Z]*')
+    _LIC_RE = re.compile(r'LIC-[A-Z0-9-]+')
+    # Same model pattern as one capture group, for Series.str.extract
+    _MODEL_EXTRACT_PATTERN = r'((?:MR|MX|MS|MV|MT)\d+[A-Z]*(?:-\d+[A-Z]*)?)'
+    
+    # Date shapes and the one strptime format that can parse each (checked in _parse_date)
+    _DATE_PATTERNS = (
+        (re.compile(r'[A-Za-z]+\s+\d{1,2},\s+\d{4}'), '%B %d, %Y'),
+        (re.compile(r'\d{1,2}/\d{1,2}/\d{4}'), '%m/%d/%Y'),
+        (re.compile(r'\d{4}-\d{1,2}-\d{1,2}'), '%Y-%m-%d'),
+        (re.compile(r'\d{1,2}\.\d{1,2}\.\d{4}'), '%d.%m.%Y'),
+    )
+    
+    # License SKU markers -> tier / term, first match wins ('ENT' before 'SEC'/'ADV', '1YR' before '3YR')
+    _LICENSE_TIERS = (('ENT', 'ent'), ('SEC', 'adv'), ('ADV', 'adv'))
+    _LICENSE_TERMS = (('1YR', '1_year'), ('3YR', '3_year'), ('5YR', '5_year'))
+    
+    # Scraped spec name (lowercase substring) -> standardized field, first match wins
+    _SPEC_NAME_MAP = (
+        ('wi-fi standard', 'wifi_standard'),
+        ('maximum data rate', 'max_data_rate'),
+        ('spatial streams', 'spatial_streams'),
+        ('frequency bands', 'frequency_bands'),
+        ('poe requirement', 'poe_requirement'),
+        ('power consumption', 'max_power_consumption'),
+        ('ethernet ports', 'ethernet_ports'),
+        ('dimensions', 'dimensions'),
+        ('weight', 'weight'),
+        ('operating temperature', 'operating_temp'),
+        ('firewall throughput', 'firewall_throughput'),
+        ('vpn throughput', 'vpn_throughput'),
+        ('recommended users', 'recommended_users'),
+        ('total ports', 'total_ports'),
+        ('poe budget', 'poe_budget'),
+        ('switching capacity', 'switching_capacity'),
+    )
+    
     def __init__(self):
         self.session = requests.Session()
         self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+            'Accept-Encoding': 'gzip, deflate'
         })
         
+        # Pooled connections with retry/backoff on transient errors
+        retry = Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(max_retries=retry, pool_connections=10, pool_maxsize=20)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        
+        # Last 200 response per URL with ETag/Last-Modified, for conditional GETs
+        self._validated_responses = {}
+        
         # Base URLs
         self.base_urls = {
             'meraki_docs': 'https://documentation.meraki.com',
@@ -29,7 +92,10 @@ class CiscoMerakiScraper:
             'meraki_datasheet_base': 'https://documentation.meraki.com/{category}/Product_Information/Overviews_and_Datasheets',
         }
         
-        self.rate_limit_delay = 2  # seconds between requests
+        self.rate_limit_delay = 2  # seconds between request starts (shared by all threads)
+        self.max_workers = 4  # concurrent datasheet fetches
+        self._rate_lock = threading.Lock()
+        self._next_request_at = 0.0
     
     def scrape_meraki_eol_dates(self) -> Dict[str, Dict]:
         """
@@ -47,46 +113,48 @@ class CiscoMerakiScraper:
         st.info("🔍 Scraping Meraki EOL Daten...")
         
         try:
-            response = self.session.get(self.base_urls['meraki_eol'], timeout=10)
+            response = self._get(self.base_urls['meraki_eol'], timeout=10)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
-            eol_data = {}
+            # EOL tables (header row becomes the column index)
+            try:
+                tables = pd.read_html(io.StringIO(response.text), flavor='lxml', keep_default_na=False)
+            except ValueError:
+                # No tables on the page
+                tables = []
             
-            # Find EOL tables
-            tables = soup.find_all('table')
+            eol_data = {}
             
-            for table in tables:
-                rows = table.find_all('tr')
+            for df in tables:
+                if df.shape[1] < 3:
+                    continue
                 
-                for row in rows[1:]:  # Skip header
-                    cols = row.find_all('td')
-                    if len(cols) >= 3:
-                        product = cols[0].get_text(strip=True)
-                        eol_announced = cols[1].get_text(strip=True)
-                        eos_date = cols[2].get_text(strip=True)
-                        
-                        # Parse dates
-                        eol_announced_parsed = self._parse_date(eol_announced)
-                        eos_date_parsed = self._parse_date(eos_date)
-                        
-                        # Determine status
-                        status = self._determine_status(eol_announced_parsed, eos_date_parsed)
-                        
-                        # Extract model number
-                        model = self._extract_model_number(product)
-                        
-                        if model:
-                            eol_data[model.lower()] = {
-                                'eol_announced': eol_announced_parsed,
-                                'eos_date': eos_date_parsed,
-                                'status': status,
-                                'full_name': product
-                            }
+                # Product, EOL announcement and end-of-sale columns as stripped text
+                cells = df.iloc[:, :3].fillna('').astype(str)
+                products = cells.iloc[:, 0].str.strip()
+                models = products.str.extract(self._MODEL_EXTRACT_PATTERN, expand=False)
+                has_model = models.notna()
+                if not has_model.any():
+                    continue
+                
+                eol_announced = cells.iloc[:, 1].str.strip()[has_model]
+                eos_dates = cells.iloc[:, 2].str.strip()[has_model]
+                
+                # Parse each distinct date string once (dates repeat across many rows)
+                parsed_dates = {d: self._parse_date(d) for d in pd.unique(pd.concat([eol_announced, eos_dates]))}
+                
+                for product, model, announced, eos in zip(
+                    products[has_model], models[has_model],
+                    [parsed_dates[d] for d in eol_announced], [parsed_dates[d] for d in eos_dates]
+                ):
+                    eol_data[model.lower()] = {
+                        'eol_announced': announced,
+                        'eos_date': eos,
+                        'status': self._determine_status(announced, eos),
+                        'full_name': product
+                    }
             
             st.success(f"✅ {len(eol_data)} EOL Einträge gefunden")
-            time.sleep(self.rate_limit_delay)
-            
             return eol_data
         
         except Exception as e:
@@ -110,14 +178,14 @@ class CiscoMerakiScraper:
             # Construct datasheet URL
             datasheet_url = f"{self.base_urls['meraki_docs']}/{category}/Product_Information/Overviews_and_Datasheets/{model}_Datasheet"
             
-            response = self.session.get(datasheet_url, timeout=10)
+            response = self._get(datasheet_url, timeout=10)
             
             if response.status_code == 404:
                 st.warning(f"⚠️ Datasheet nicht gefunden: {datasheet_url}")
                 return None
             
             response.raise_for_status()
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = BeautifulSoup(response.content, 'lxml')
             
             specs = {
                 'model': model,
@@ -125,21 +193,17 @@ class CiscoMerakiScraper:
                 'scraped_at': datetime.now().isoformat()
             }
             
-            # Extract specifications from tables
-            tables = soup.find_all('table')
-            
-            for table in tables:
-                rows = table.find_all('tr')
-                for row in rows:
-                    cols = row.find_all(['th', 'td'])
-                    if len(cols) >= 2:
-                        key = cols[0].get_text(strip=True)
-                        value = cols[1].get_text(strip=True)
-                        
-                        # Map common spec names
-                        spec_key = self._map_spec_name(key)
-                        if spec_key:
-                            specs[spec_key] = value
+            # Extract specifications from table rows (one selector sweep over all tables)
+            for row in soup.select('table tr'):
+                cols = row.select('th, td')
+                if len(cols) >= 2:
+                    key = cols[0].get_text(strip=True)
+                    value = cols[1].get_text(strip=True)
+                    
+                    # Map common spec names
+                    spec_key = self._map_spec_name(key)
+                    if spec_key:
+                        specs[spec_key] = value
             
             # Extract SKUs
             skus = self._extract_skus_from_page(soup, model)
@@ -148,8 +212,6 @@ class CiscoMerakiScraper:
                 specs['sku_licenses'] = skus.get('licenses', {})
             
             st.success(f"✅ Datasheet für {model} erfolgreich gescraped")
-            time.sleep(self.rate_limit_delay)
-            
             return specs
         
         except Exception as e:
@@ -167,26 +229,24 @@ class CiscoMerakiScraper:
         
         try:
             url = f"{self.base_urls['meraki_docs']}/MR/Product_Information"
-            response = self.session.get(url, timeout=10)
+            response = self._get(url, timeout=10)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = BeautifulSoup(response.content, 'lxml')
             models = set()
             
             # Find all links mentioning MR models
-            links = soup.find_all('a', href=True)
+            links = soup.select('a[href]')
             
             for link in links:
                 text = link.get_text()
                 # Match MR followed by digits (MR20, MR46, etc.)
-                match = re.search(r'MR\d+[A-Z]*', text)
+                match = self._MR_RE.search(text)
                 if match:
                     models.add(match.group(0))
             
             models_list = sorted(list(models))
             st.success(f"✅ {len(models_list)} MR Modelle gefunden")
-            time.sleep(self.rate_limit_delay)
-            
             return models_list
         
         except Exception as e:
@@ -204,21 +264,21 @@ class CiscoMerakiScraper:
         
         try:
             url = "https://www.cisco.com/c/en/us/products/security/identity-services-engine/models-comparison.html"
-            response = self.session.get(url, timeout=10)
+            response = self._get(url, timeout=10)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = BeautifulSoup(response.content, 'lxml')
             models = []
             
             # Find comparison table
-            tables = soup.find_all('table', class_='comparison-table')
+            tables = soup.select('table.comparison-table')
             
             for table in tables:
-                rows = table.find_all('tr')
-                headers = [th.get_text(strip=True) for th in rows[0].find_all('th')]
+                rows = table.select('tr')
+                headers = [th.get_text(strip=True) for th in rows[0].select('th')]
                 
                 for row in rows[1:]:
-                    cols = row.find_all('td')
+                    cols = row.select('td')
                     if len(cols) >= len(headers):
                         model_data = {}
                         for i, col in enumerate(cols):
@@ -228,8 +288,6 @@ class CiscoMerakiScraper:
                         models.append(model_data)
             
             st.success(f"✅ {len(models)} ISE Modelle gefunden")
-            time.sleep(self.rate_limit_delay)
-            
             return models
         
         except Exception as e:
@@ -258,6 +316,7 @@ class CiscoMerakiScraper:
         
         for category in ['mr', 'mx', 'ms', 'mv']:
             products = product_loader.get_products_by_category(category)
+            updated_products = []
             
             for product in products:
                 product_id = product.get('id', '').lower()
@@ -272,11 +331,14 @@ class CiscoMerakiScraper:
                     product['eos_date'] = eol_info.get('eos_date')
                     product['status'] = eol_info.get('status')
                     
-                    # Save updated product
-                    product_loader.save_product(category, product)
+                    updated_products.append(product)
                     updated_count += 1
                     
                     st.success(f"✅ {product.get('name')}: Status aktualisiert auf '{eol_info.get('status')}'")
+            
+            # Save all updated products of this category at once
+            if updated_products:
+                product_loader.save_products_bulk(category, updated_products)
         
         st.success(f"🎉 {updated_count} Produkte aktualisiert!")
         return updated_count
@@ -295,15 +357,30 @@ class CiscoMerakiScraper:
             return 0
         
         updated_count = 0
+        updated_products = []
         
         progress_bar = st.progress(0)
         status_text = st.empty()
         
-        for i, model in enumerate(models):
-            status_text.text(f"Scraping {i+1}/{len(models)}: {model}")
-            progress_bar.progress((i + 1) / len(models))
+        # Fetch datasheets concurrently; _get keeps the shared request rate
+        ctx = get_script_run_ctx()
+        
+        def attach_ctx():
+            add_script_run_ctx(threading.current_thread(), ctx)
+        
+        specs_by_model = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers, initializer=attach_ctx) as executor:
+            futures = {executor.submit(self.scrape_product_datasheet, 'MR', model): model for model in models}
             
-            specs = self.scrape_product_datasheet('MR', model)
+            for i, future in enumerate(as_completed(futures)):
+                model = futures[future]
+                specs_by_model[model] = future.result()
+                status_text.text(f"Scraping {i+1}/{len(models)}: {model}")
+                progress_bar.progress((i + 1) / len(models))
+        
+        # Apply results in model order
+        for model in models:
+            specs = specs_by_model.get(model)
             
             if specs:
                 # Find existing product or create new
@@ -313,7 +390,7 @@ class CiscoMerakiScraper:
                 if existing_product:
                     # Update existing
                     existing_product.update(specs)
-                    product_loader.save_product('mr', existing_product)
+                    updated_products.append(existing_product)
                 else:
                     # Create new product entry
                     new_product = {
@@ -322,10 +399,14 @@ class CiscoMerakiScraper:
                         'category': 'MR',
                         **specs
                     }
-                    product_loader.save_product('mr', new_product)
+                    updated_products.append(new_product)
                 
                 updated_count += 1
         
+        # Save all scraped products with a single file rewrite
+        if updated_products:
+            product_loader.save_products_bulk('mr', updated_products)
+        
         progress_bar.empty()
         status_text.empty()
         
@@ -334,24 +415,53 @@ class CiscoMerakiScraper:
     
     # Helper methods
     
-    def _parse_date(self, date_str: str) -> Optional[str]:
-        """Parse date string to ISO format (YYYY-MM-DD)"""
+    def _wait_for_rate_limit(self):
+        """Block until the next request slot (one request start per rate_limit_delay)"""
+        with self._rate_lock:
+            now = time.monotonic()
+            wait = self._next_request_at - now
+            self._next_request_at = max(now, self._next_request_at) + self.rate_limit_delay
+        
+        if wait > 0:
+            time.sleep(wait)
+    
+    def _get(self, url: str, timeout: int = 10) -> requests.Response:
+        """GET with ETag/Last-Modified revalidation (a 304 reuses the stored response)"""
+        self._wait_for_rate_limit()
+        
+        cached = self._validated_responses.get(url)
+        headers = {}
+        if cached is not None:
+            if cached.headers.get('ETag'):
+                headers['If-None-Match'] = cached.headers['ETag']
+            if cached.headers.get('Last-Modified'):
+                headers['If-Modified-Since'] = cached.headers['Last-Modified']
+        
+        response = self.session.get(url, timeout=timeout, headers=headers)
+        
+        if response.status_code == 304 and cached is not None:
+            return cached
+        if response.status_code == 200 and ('ETag' in response.headers or 'Last-Modified' in response.headers):
+            self._validated_responses[url] = response
+        return response
+    
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _parse_date(date_str: str) -> Optional[str]:
+        """Parse date string to ISO format (YYYY-MM-DD); cached, dates repeat across rows"""
         if not date_str or date_str.lower() in ['n/a', 'tbd', '-']:
             return None
         
-        try:
-            # Try common formats
-            for fmt in ['%B %d, %Y', '%m/%d/%Y', '%Y-%m-%d', '%d.%m.%Y']:
+        # Pick the format by shape instead of probing strptime with every format
+        for pattern, fmt in CiscoMerakiScraper._DATE_PATTERNS:
+            if pattern.fullmatch(date_str):
                 try:
-                    dt = datetime.strptime(date_str, fmt)
-                    return dt.strftime('%Y-%m-%d')
+                    return datetime.strptime(date_str, fmt).strftime('%Y-%m-%d')
                 except ValueError:
-                    continue
-            
-            # If all fails, return original
-            return date_str
-        except:
-            return None
+                    break
+        
+        # Unknown format: return original
+        return date_str
     
     def _determine_status(self, eol_announced: Optional[str], eos_date: Optional[str]) -> str:
         """Determine product status based on dates"""
@@ -374,35 +484,18 @@ class CiscoMerakiScraper:
     def _extract_model_number(self, product_name: str) -> Optional[str]:
         """Extract model number from product name"""
         # Match patterns like MR46, MX250, MS225-48FP, etc.
-        match = re.search(r'(MR|MX|MS|MV|MT)\d+[A-Z]*(-\d+[A-Z]*)?', product_name)
+        match = self._MODEL_RE.search(product_name)
         return match.group(0) if match else None
     
-    def _map_spec_name(self, raw_name: str) -> Optional[str]:
-        """Map scraped spec names to standardized field names"""
-        mapping = {
-            'Wi-Fi Standard': 'wifi_standard',
-            'Maximum Data Rate': 'max_data_rate',
-            'Spatial Streams': 'spatial_streams',
-            'Frequency Bands': 'frequency_bands',
-            'PoE Requirement': 'poe_requirement',
-            'Power Consumption': 'max_power_consumption',
-            'Ethernet Ports': 'ethernet_ports',
-            'Dimensions': 'dimensions',
-            'Weight': 'weight',
-            'Operating Temperature': 'operating_temp',
-            'Firewall Throughput': 'firewall_throughput',
-            'VPN Throughput': 'vpn_throughput',
-            'Recommended Users': 'recommended_users',
-            'Total Ports': 'total_ports',
-            'PoE Budget': 'poe_budget',
-            'Switching Capacity': 'switching_capacity',
-        }
-        
-        for key, value in mapping.items():
-            if key.lower() in raw_name.lower():
-                return value
-        
-        return None
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _map_spec_name(raw_name: str) -> Optional[str]:
+        """Map scraped spec names to standardized field names (cached per raw name)"""
+        raw_lower = raw_name.lower()
+        return next(
+            (field for key, field in CiscoMerakiScraper._SPEC_NAME_MAP if key in raw_lower),
+            None
+        )
     
     def _extract_skus_from_page(self, soup: BeautifulSoup, model: str) -> Optional[Dict]:
         """Extract SKUs from product page"""
@@ -411,49 +504,73 @@ class CiscoMerakiScraper:
             'licenses': {}
         }
         
-        # Look for SKU mentions in text
-        text = soup.get_text()
-        
-        # Hardware SKU pattern (e.g., MR46-HW)
-        hw_match = re.search(rf'{model}-HW', text, re.IGNORECASE)
+        # Hardware SKU pattern (e.g., MR46-HW); full page text, since markup may split it (<b>MR46</b>-HW)
+        hw_match = re.search(rf'{model}-HW', soup.get_text(), re.IGNORECASE)
         if hw_match:
             skus['hardware'] = hw_match.group(0).upper()
         
-        # License SKU patterns (e.g., LIC-ENT-1YR, LIC-MX67-SEC-3YR)
-        license_matches = re.findall(r'LIC-[A-Z0-9-]+', text)
+        # License SKU patterns (e.g., LIC-ENT-1YR, LIC-MX67-SEC-3YR), only in text nodes that contain one
+        text = ' '.join(string for string in soup.strings if 'LIC-' in string)
+        license_matches = self._LIC_RE.findall(text)
         
         for lic_sku in license_matches:
-            # Determine license type from SKU
-            if 'ENT' in lic_sku:
-                if '1YR' in lic_sku:
-                    skus['licenses']['1_year_ent'] = lic_sku
-                elif '3YR' in lic_sku:
-                    skus['licenses']['3_year_ent'] = lic_sku
-                elif '5YR' in lic_sku:
-                    skus['licenses']['5_year_ent'] = lic_sku
-            elif 'SEC' in lic_sku or 'ADV' in lic_sku:
-                if '1YR' in lic_sku:
-                    skus['licenses']['1_year_adv'] = lic_sku
-                elif '3YR' in lic_sku:
-                    skus['licenses']['3_year_adv'] = lic_sku
-                elif '5YR' in lic_sku:
-                    skus['licenses']['5_year_adv'] = lic_sku
+            # Determine license type from SKU (later matches overwrite earlier ones)
+            license_key = self._license_key(lic_sku)
+            if license_key:
+                skus['licenses'][license_key] = lic_sku
         
         return skus if skus['hardware'] or skus['licenses'] else None
     
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _license_key(lic_sku: str) -> Optional[str]:
+        """Classify a license SKU as e.g. '3_year_ent' (cached, the same SKUs repeat across pages)"""
+        tier = next((tier for marker, tier in CiscoMerakiScraper._LICENSE_TIERS if marker in lic_sku), None)
+        term = next((term for marker, term in CiscoMerakiScraper._LICENSE_TERMS if marker in lic_sku), None)
+        return f"{term}_{tier}" if tier and term else None
+    
     def export_scraped_data(self, data: Dict, filename: str):
         """Export scraped data to JSON file"""
         try:
-            with open(f"data/scraped/{filename}", 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            filepath = f"data/scraped/{filename}"
+            if isinstance(data, dict):
+                self._write_json_streamed(filepath, data)
+            else:
+                write_json_file(filepath, data)
             
             st.success(f"✅ Daten exportiert nach: data/scraped/{filename}")
         except Exception as e:
             st.error(f"❌ Fehler beim Exportieren: {str(e)}")
 
 
+    @staticmethod
+    def _write_json_streamed(filepath: str, data: Dict):
+        """
+        Write a dict as indented JSON one top-level entry at a time
+        
+        Only one entry is serialized in memory at once. Values go through dumps_json
+        (the serializer write_json_file uses); non-string keys are converted like
+        json does (True -> "true", None -> "null", 1 -> "1").
+        """
+        with open(filepath, 'w', encoding='utf-8') as f:
+            if not data:
+                f.write('{}')
+                return
+            
+            f.write('{')
+            separator = '\n'
+            for key, value in data.items():
+                if not isinstance(key, str):
+                    key = json.dumps(key)  # bool/None/int/float; other key types raise TypeError like json
+                value_json = dumps_json(value).replace('\n', '\n  ')
+                f.write(f'{separator}  {json.dumps(key, ensure_ascii=False)}: {value_json}')
+                separator = ',\n'
+            f.write('\n}')
+
+
 # Global instance
+@st.cache_resource
 def get_scraper():
-    """Get CiscoMerakiScraper instance"""
+    """Get cached CiscoMerakiScraper instance"""
     return CiscoMerakiScraper()
 
@@ -0,0 +1,44 @@
+"""
+Translations Utility
+Loads UI translations from data/translations.json
+"""
+
+import streamlit as st
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    import json
+    ORJSON_AVAILABLE = False
+
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+TRANSLATIONS_FILE = "data/translations.json"
+
+
+@st.cache_data(ttl=3600)
+def load_translations() -> dict:
+    """Load all translations (cached across reruns and sessions)"""
+    with open(TRANSLATIONS_FILE, 'rb') as f:
+        raw = f.read()
+    
+    # orjson parses bytes directly and is considerably faster on a cold load
+    if ORJSON_AVAILABLE:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+@st.cache_data(ttl=3600)
+def load_language(lang: str) -> dict:
+    """Load translations for a single language (cached per language)"""
+    if IJSON_AVAILABLE:
+        # Stream-parse and only materialize the requested language subtree
+        with open(TRANSLATIONS_FILE, 'rb') as f:
+            return next(ijson.items(f, lang), {})
+    
+    return load_translations().get(lang, {})